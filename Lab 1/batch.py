@@ -0,0 +1,48 @@
+from typing import Type
+from concurrent.futures import ProcessPoolExecutor
+import csv
+
+from fileio import dict_type_to_string
+from zeroplayer.location import Location
+from zeroplayer.metrics import population_types
+from zeroplayer.animals import location
+
+
+#region //// Runs
+
+def count_population(locale: Location) -> list[int]:
+    """Returns amount of entities of each of population_types on the field"""
+    return [locale.count_of_type(entity_type) for entity_type in population_types]
+
+
+def run_population(seed: int, steps: int, location_type: Type[Location] = location.WoodlandEdge) -> list[list[int]]:
+    """
+    Creates a new location with its random seeded
+    and steps it, counting population before the first step and after every step.
+    """
+    locale = location_type(seed=seed)
+
+    counts = [count_population(locale)]
+    for _ in range(steps):
+        locale.step()
+        counts.append(count_population(locale))
+
+    return counts
+
+
+def run_batch(filename: str, seeds: range, steps: int, workers: int | None = None):
+    """
+    Runs a population study for each seed in worker processes
+    and writes population counts to a single csv file (one row per seed per step).
+    """
+    with open(filename, mode="wt", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["seed", "step"] + [dict_type_to_string[entity_type] for entity_type in population_types])
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            runs = executor.map(run_population, seeds, [steps] * len(seeds))
+
+            for seed, counts in zip(seeds, runs):
+                writer.writerows([seed, step] + step_counts for step, step_counts in enumerate(counts))
+
+#endregion
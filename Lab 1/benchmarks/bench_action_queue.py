@@ -0,0 +1,61 @@
+"""
+Compares ActionPriorityQueue against the former queue.PriorityQueue based implementation.
+Run from the Lab 1 directory: python -m benchmarks.bench_action_queue
+"""
+from typing import Callable
+from queue import PriorityQueue
+import timeit
+
+from utils.action_queue import ActionPriorityItem, ActionPriorityQueue
+from zeroplayer.step_priorities import StepPriority
+
+
+class HeapActionPriorityQueue:
+    """The former implementation (queue.PriorityQueue of ActionPriorityItem)"""
+
+    def __init__(self):
+        self.__actions = PriorityQueue()
+
+    def enqueue(self, priority, action: Callable[[], None]) -> None:
+        self.__actions.put(ActionPriorityItem(priority, action))
+
+    def perform(self) -> None:
+        while not self.__actions.empty():
+            self.__actions.get().action()
+
+
+def noop():
+    pass
+
+
+def run_tick(queue, entities: int) -> None:
+    # Roughly what a creature enqueues per tick
+    priorities = (
+        StepPriority.LIFETIME, StepPriority.KILL, StepPriority.MOVE, StepPriority.LEAP_ATTACK,
+        StepPriority.SEARCH, StepPriority.WANDER, StepPriority.LEAP_MOVE, StepPriority.DECAY,
+        StepPriority.AGE, StepPriority.PROCREATION
+    )
+    for _ in range(entities):
+        for priority in priorities:
+            queue.enqueue(priority, noop)
+    queue.perform()
+
+
+def main():
+    entities = 5000
+    repeats = 5
+
+    contenders = (
+        ("PriorityQueue (former)", HeapActionPriorityQueue),
+        ("ActionPriorityQueue", lambda: ActionPriorityQueue(StepPriority)),
+    )
+
+    print(f"{entities} entities x 10 actions per tick, best of {repeats}")
+    for name, factory in contenders:
+        queue = factory()
+        best = min(timeit.repeat(lambda: run_tick(queue, entities), number=1, repeat=repeats))
+        print(f"{name:>24}: {best * 1000:8.2f} ms/tick")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Compares memory taken by slotted entities against the former __dict__ based layout.
+Run from the Lab 1 directory: python -m benchmarks.bench_entity_memory
+"""
+from typing import Callable
+import tracemalloc
+
+from zeroplayer.animals import plants, herbivores
+
+
+class DictBacked:
+    """The former layout: same (name-mangled) fields, stored in the instance __dict__"""
+    pass
+
+
+def slot_names(cls: type) -> list[str]:
+    names = []
+    for klass in cls.__mro__:
+        for name in klass.__dict__.get("__slots__", ()):
+            names.append(f"_{klass.__name__.lstrip('_')}{name}" if name.startswith("__") else name)
+    return names
+
+
+def as_dict_backed(entity) -> DictBacked:
+    # One class per entity type, so instances share dict keys as the former ones did
+    copy = dict_backed_types.setdefault(type(entity), type(f"DictBacked{type(entity).__name__}", (DictBacked,), {}))()
+    for name in slot_names(type(entity)):
+        setattr(copy, name, getattr(entity, name))
+    return copy
+
+
+dict_backed_types: dict[type, type] = {}
+
+
+def bytes_per_instance(factory: Callable[[], object], count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Exclude the list holding the instances
+    per_instance = (after - before - instances.__sizeof__()) / count
+    del instances
+    return per_instance
+
+
+def main():
+    count = 100_000
+
+    print(f"{count} instances each, bytes per entity")
+    print(f"{'entity':>12}{'__dict__ (former)':>20}{'slots':>10}")
+    for entity_type in (plants.Grass, herbivores.Mouse):
+        slotted = bytes_per_instance(entity_type, count)
+        dict_backed = bytes_per_instance(lambda: as_dict_backed(entity_type()), count)
+        print(f"{entity_type.__name__:>12}{dict_backed:>20.1f}{slotted:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
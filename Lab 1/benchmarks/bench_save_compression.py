@@ -0,0 +1,66 @@
+"""
+Compares file size and save/load time of save formats and compressions on large WoodlandEdge worlds.
+Compressions whose modules are not installed (zstd, lz4) are skipped.
+Run from the Lab 1 directory: python -m benchmarks.bench_save_compression
+"""
+import os
+import tempfile
+import time
+
+import fileio
+from zeroplayer.location import Location
+from zeroplayer.animals.location import WoodlandEdge
+
+
+def large_woodland_edge(width: int, height: int, seed: int) -> WoodlandEdge:
+    """Returns a WoodlandEdge of given size, populated by its spawn rules and a few steps"""
+    source = Location(width, height, WoodlandEdge._spawn_rules, width * height // 20, seed)
+    for _ in range(3):
+        source.step()
+
+    locale = WoodlandEdge(create_empty=True)
+    locale.restore_from_snapshot(source.form_snapshot())
+    locale.random.setstate(source.random.getstate())
+    return locale
+
+
+def measure(locale: WoodlandEdge, filename: str, save_format: str, compression: str) -> tuple[int, float, float]:
+    """Returns file size, save time and load time"""
+    start = time.perf_counter()
+    fileio.save_location(filename, locale, save_format, compression)
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fileio.load_location(filename)
+    load_time = time.perf_counter() - start
+
+    return os.path.getsize(filename), save_time, load_time
+
+
+def main():
+    sizes = ((200, 200), (500, 500))
+    compressions = [c for c in (
+        fileio.Compression.none, fileio.Compression.gzip, fileio.Compression.bz2,
+        fileio.Compression.xz, fileio.Compression.zstd, fileio.Compression.lz4
+    ) if c in fileio.compression_openers]
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "world.sav")
+
+        for width, height in sizes:
+            locale = large_woodland_edge(width, height, seed=1)
+            print(f"{width}x{height}, {len(locale.entities())} entities")
+            print(f"{'format':>8}{'compression':>13}{'size, KiB':>12}{'save, ms':>10}{'load, ms':>10}")
+
+            for save_format in (fileio.SaveFormat.json, fileio.SaveFormat.binary):
+                for compression in compressions:
+                    size, save_time, load_time = measure(locale, filename, save_format, compression)
+                    print(
+                        f"{save_format:>8}{compression:>13}{size / 1024:>12.1f}"
+                        f"{save_time * 1000:>10.1f}{load_time * 1000:>10.1f}"
+                    )
+            print()
+
+
+if __name__ == '__main__':
+    main()
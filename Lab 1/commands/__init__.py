@@ -4,7 +4,13 @@ __all__ = [
     "new",
     "place",
     "step",
-    "natural_spawn"
+    "natural_spawn",
+    "serve",
+    "compact",
+    "batch",
+    "watch",
+    "export",
+    "inspect"
 ]
 
 from . import *
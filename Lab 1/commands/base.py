@@ -3,6 +3,8 @@ from typing import Final
 from abc import ABC, abstractmethod
 import argparse
 
+from save_formats import SaveFormat
+
 
 class ArgParser:
 
@@ -32,6 +34,31 @@ class ArgParser:
             help="When printing removes any and all color"
         )
 
+        self.parser.add_argument(
+            "--profile",
+            action="store_true",
+            dest=DestName.profile,
+            help="Prints timings of simulation steps per phase, action priority and entity class"
+        )
+
+        self.parser.add_argument(
+            "--metrics",
+            action="store",
+            dest=DestName.metrics,
+            default=None,
+            metavar="CSV_FILE",
+            help="Appends population metrics of every performed step to a csv file"
+        )
+
+        self.parser.add_argument(
+            "-f", "--format",
+            action="store",
+            dest=DestName.save_format,
+            choices=(SaveFormat.json, SaveFormat.binary),
+            default=None,
+            help="Format to save the file in. Keeps the format of the file by default (json for new files)"
+        )
+
         # Create place for subcommands
         self.subparsers = self.parser.add_subparsers(title="subcommands", dest=DestName.subcommand)
         self.parser.set_defaults(subcommand=SubcommandName.nocommand)
@@ -81,6 +108,17 @@ class SubcommandName:
     place: Final[str] = "place"
     step: Final[str] = "step"
     natural_spawn: Final[str] = "natural"
+    serve: Final[str] = "serve"
+    compact: Final[str] = "compact"
+    batch: Final[str] = "batch"
+    watch: Final[str] = "watch"
+    export: Final[str] = "export"
+    inspect: Final[str] = "inspect"
+
+    # Read by serve
+    serve_print: Final[str] = "print"
+    serve_save: Final[str] = "save"
+    serve_quit: Final[str] = "quit"
 
 
 class DestName:
@@ -90,9 +128,14 @@ class DestName:
     subcommand: Final[str] = "subcommand"
     print: Final[str] = "flag_print"
     uncolored: Final[str] = "flag_uncolored"
+    save_format: Final[str] = "save_format"
+    profile: Final[str] = "flag_profile"
+    metrics: Final[str] = "metrics_filename"
 
     # New
     new_empty: Final[str] = "create_empty"
+    new_size: Final[str] = "size"
+    new_sparse: Final[str] = "sparse"
 
     # Place
     place_x: Final[str] = "x"
@@ -105,4 +148,21 @@ class DestName:
     # Natural spawning
     natural_lock: Final[str] = "lock_state"
 
+    # Serve
+    serve_checkpoint: Final[str] = "checkpoint_steps"
+
+    # Batch
+    batch_seed_first: Final[str] = "seed_first"
+    batch_seed_last: Final[str] = "seed_last"
+    batch_steps: Final[str] = "batch_steps"
+    batch_workers: Final[str] = "workers"
+
+    # Watch
+    watch_steps: Final[str] = "watch_steps"
+    watch_sps: Final[str] = "steps_per_second"
+    watch_fps: Final[str] = "frames_per_second"
+
+    # Export
+    export_filename: Final[str] = "export_filename"
+
 #endregion
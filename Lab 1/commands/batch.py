@@ -0,0 +1,42 @@
+from commands.base import SubcommandInfo, SubcommandName, DestName
+
+
+class SubcommandBatch(SubcommandInfo):
+
+    @staticmethod
+    def get_name():
+        return SubcommandName.batch
+
+    @staticmethod
+    def get_help():
+        return "Runs new simulations for a range of random seeds in parallel " \
+               "and writes population counts per step to the file (csv). Does not touch save files"
+
+    @staticmethod
+    def form_parser(parser) -> None:
+        parser.add_argument(
+            DestName.batch_seed_first,
+            action="store",
+            help="First seed",
+            type=int
+        )
+        parser.add_argument(
+            DestName.batch_seed_last,
+            action="store",
+            help="Last seed (inclusive)",
+            type=int
+        )
+        parser.add_argument(
+            DestName.batch_steps,
+            action="store",
+            help="How many steps to perform per simulation",
+            type=int
+        )
+        parser.add_argument(
+            "-w", "--workers",
+            action="store",
+            dest=DestName.batch_workers,
+            help="Amount of worker processes (defaults to amount of processors)",
+            type=int,
+            default=None
+        )
@@ -0,0 +1,16 @@
+from commands.base import SubcommandInfo, SubcommandName
+
+
+class SubcommandCompact(SubcommandInfo):
+
+    @staticmethod
+    def get_name():
+        return SubcommandName.compact
+
+    @staticmethod
+    def get_help():
+        return "Merges the journal of incremental changes into the save file"
+
+    @staticmethod
+    def form_parser(parser) -> None:
+        pass
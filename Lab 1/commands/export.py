@@ -0,0 +1,21 @@
+from commands.base import SubcommandInfo, SubcommandName, DestName
+
+
+class SubcommandExport(SubcommandInfo):
+
+    @staticmethod
+    def get_name():
+        return SubcommandName.export
+
+    @staticmethod
+    def get_help():
+        return "Writes the field into a field file, which can be inspected without loading the simulation"
+
+    @staticmethod
+    def form_parser(parser) -> None:
+        parser.add_argument(
+            DestName.export_filename,
+            action="store",
+            metavar="FIELD_FILE",
+            help="Field file to write"
+        )
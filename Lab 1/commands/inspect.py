@@ -0,0 +1,16 @@
+from commands.base import SubcommandInfo, SubcommandName
+
+
+class SubcommandInspect(SubcommandInfo):
+
+    @staticmethod
+    def get_name():
+        return SubcommandName.inspect
+
+    @staticmethod
+    def get_help():
+        return "Prints the field and population of a field file (the given file), reading it in place"
+
+    @staticmethod
+    def form_parser(parser) -> None:
+        pass
@@ -19,3 +19,19 @@ class SubcommandNew(SubcommandInfo):
             dest=DestName.new_empty,
             help="Do not perform initial entity spawning"
         )
+        parser.add_argument(
+            "-s", "--size",
+            action="store",
+            dest=DestName.new_size,
+            help="Width and height of the field (20 by 10 by default)",
+            type=int,
+            nargs=2,
+            metavar=("WIDTH", "HEIGHT"),
+            default=None
+        )
+        parser.add_argument(
+            "--sparse",
+            action="store_true",
+            dest=DestName.new_sparse,
+            help="Store only occupied cells (for large, mostly empty fields)"
+        )
@@ -0,0 +1,116 @@
+from __future__ import annotations
+from typing import Iterable, NoReturn
+import argparse
+import shlex
+
+from commands.base import SubcommandInfo, SubcommandName, DestName
+from utils.exceptions import InvalidInputError
+
+
+class SubcommandServe(SubcommandInfo):
+
+    @staticmethod
+    def get_name():
+        return SubcommandName.serve
+
+    @staticmethod
+    def get_help():
+        return "Keeps the simulation in memory and performs commands read from stdin, one per line " \
+               "(step, place, natural, print, save, quit)"
+
+    @staticmethod
+    def form_parser(parser) -> None:
+        parser.add_argument(
+            "-c", "--checkpoint",
+            action="store",
+            dest=DestName.serve_checkpoint,
+            help="Save the simulation every N performed steps (0 - only on 'save' command)",
+            type=int,
+            default=0
+        )
+
+
+#region //// Commands read by serve
+
+class SubcommandServePrint(SubcommandInfo):
+
+    @staticmethod
+    def get_name():
+        return SubcommandName.serve_print
+
+    @staticmethod
+    def get_help():
+        return "Prints the simulation state"
+
+    @staticmethod
+    def form_parser(parser) -> None:
+        parser.add_argument(
+            "-u", "--uncolored",
+            action="store_true",
+            dest=DestName.uncolored,
+            help="Removes any and all color"
+        )
+
+
+class SubcommandServeSave(SubcommandInfo):
+
+    @staticmethod
+    def get_name():
+        return SubcommandName.serve_save
+
+    @staticmethod
+    def get_help():
+        return "Saves the simulation to the file"
+
+    @staticmethod
+    def form_parser(parser) -> None:
+        pass
+
+
+class SubcommandServeQuit(SubcommandInfo):
+
+    @staticmethod
+    def get_name():
+        return SubcommandName.serve_quit
+
+    @staticmethod
+    def get_help():
+        return "Stops serving without saving"
+
+    @staticmethod
+    def form_parser(parser) -> None:
+        pass
+
+
+class ServeCommandParser:
+    """Parses single command lines read by serve. Raises InvalidInputError instead of exiting."""
+
+    class _ArgumentParser(argparse.ArgumentParser):
+
+        def error(self, message: str) -> NoReturn:
+            raise InvalidInputError(message)
+
+        def exit(self, status: int = 0, message: str | None = None) -> NoReturn:
+            raise InvalidInputError(message or "command not performed")
+
+    def __init__(self, subcommands: Iterable[SubcommandInfo]):
+        self.parser = self._ArgumentParser(prog="", add_help=False)
+        self.subparsers = self.parser.add_subparsers(title="commands", dest=DestName.subcommand, required=True)
+
+        for subcommand in subcommands:
+            subparser = self.subparsers.add_parser(
+                subcommand.get_name(),
+                help=subcommand.get_help(),
+                description=subcommand.get_help(),
+                add_help=False
+            )
+            subcommand.form_parser(subparser)
+
+    def parse_line(self, line: str) -> argparse.Namespace:
+        try:
+            args = shlex.split(line)
+        except ValueError as ex:
+            raise InvalidInputError(str(ex))
+        return self.parser.parse_args(args)
+
+#endregion
@@ -0,0 +1,39 @@
+import unittest
+from commands import place, step, serve
+from commands.base import SubcommandName
+from utils.exceptions import InvalidInputError
+
+
+class TestServeCommandParser(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = serve.ServeCommandParser((
+            place.SubcommandPlace(),
+            step.SubcommandStep(),
+            serve.SubcommandServePrint(),
+            serve.SubcommandServeSave(),
+            serve.SubcommandServeQuit()
+        ))
+
+    def test_parse(self):
+        arguments = self.parser.parse_line("step 3")
+        self.assertEqual(arguments.subcommand, SubcommandName.step)
+        self.assertEqual(arguments.step_count, 3)
+
+        self.assertEqual(self.parser.parse_line("step").step_count, 1)
+
+        arguments = self.parser.parse_line("place 1 2 fox")
+        self.assertEqual((arguments.x, arguments.y, arguments.entity_type), (1, 2, "fox"))
+
+        self.assertTrue(self.parser.parse_line("print -u").flag_uncolored)
+        self.assertEqual(self.parser.parse_line("  quit  ").subcommand, SubcommandName.serve_quit)
+
+    def test_errors(self):
+        for line in ("", "jump", "step many", "place 1", "save now", "step 'unclosed", "print --help"):
+            with self.subTest(line=line):
+                with self.assertRaises(InvalidInputError):
+                    self.parser.parse_line(line)
+
+
+if __name__ == '__main__':
+    unittest.main()
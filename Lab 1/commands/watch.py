@@ -0,0 +1,39 @@
+from commands.base import SubcommandInfo, SubcommandName, DestName
+
+
+class SubcommandWatch(SubcommandInfo):
+
+    @staticmethod
+    def get_name():
+        return SubcommandName.watch
+
+    @staticmethod
+    def get_help():
+        return "Steps the simulation continuously, redrawing it in place. Stop with Ctrl+C"
+
+    @staticmethod
+    def form_parser(parser) -> None:
+        parser.add_argument(
+            "-n", "--steps",
+            action="store",
+            dest=DestName.watch_steps,
+            help="Stop after this many steps (0 - never)",
+            type=int,
+            default=0
+        )
+        parser.add_argument(
+            "--sps",
+            action="store",
+            dest=DestName.watch_sps,
+            help="Target steps per second",
+            type=float,
+            default=4.0
+        )
+        parser.add_argument(
+            "--fps",
+            action="store",
+            dest=DestName.watch_fps,
+            help="Target redraws per second",
+            type=float,
+            default=20.0
+        )
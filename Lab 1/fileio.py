@@ -1,21 +1,32 @@
-from typing import Final, Any, cast
+from typing import Final, Any, Callable, IO, Iterator, cast
 
-import random
 import json
 import errno
 import os
 import sys
+import struct
+import gzip
+import bz2
+import lzma
+import mmap
+from array import array
 from ast import literal_eval
 from utils.exceptions import VersionMismatchError
+from utils.rand_ext import random_state_struct, pack_random_state, unpack_random_state
+from save_formats import SaveFormat
 
 import zeroplayer.entities as entities
 from zeroplayer.animals import plants, herbivores, carnivores, location
 from zeroplayer.snapshotable import Snapshot
+from zeroplayer.field_columns import FieldColumns
 
 
 #region //// Constants
 
-version: Final[tuple[int, int, int]] = (0, 2, 0)
+version: Final[tuple[int, int, int]] = (0, 5, 0)
+
+# Whole saves are written to this file next to the save file first
+save_temporary_suffix: Final[str] = ".tmp"
 
 #endregion
 
@@ -108,37 +119,761 @@ def decoder(obj: Any) -> Any:
 
 #region //// Save/Load
 
-def save_location(filename: str, locale: location.Location):
+def detect_format(filename: str) -> str:
+    """Returns format of an existing save file (compressed or not)"""
+    with open_save_file(filename, "rb") as file:
+        header = file.read(len(binary_magic))
+    return SaveFormat.binary if header == binary_magic else SaveFormat.json
 
-    # Get snapshot
-    snapshot: Snapshot = locale.form_snapshot()
-    snapshot.set_data(None, "version", str(version))
-    snapshot.set_data(None, "rand_state", str(random.getstate()))
-    snapshot.set_data(None, "type", type(locale))
 
-    with open(filename, mode="wt", encoding="utf-8") as file:
-        json.dump(snapshot, file, default=encoder, indent="\t")
+def save_location(
+        filename: str,
+        locale: location.Location,
+        save_format: str = SaveFormat.json,
+        compression: str | None = None
+):
+    """
+    Saves the whole location, discarding the journal of the file.
+    If compression is not given, compression of the existing file is kept
+    (new files are compressed by their extension).
+
+    The location is written to a temporary file that replaces the save file after the journal is removed,
+    so the journal is never applied to the new file. An interrupted save keeps the old file.
+    """
+    if save_format not in (SaveFormat.binary, SaveFormat.json):
+        raise ValueError(f"Unknown save format {save_format}")
+    if compression is None:
+        compression = detect_compression(filename) if os.path.exists(filename) else compression_from_extension(filename)
+
+    temporary = filename + save_temporary_suffix
+    try:
+        if save_format == SaveFormat.binary:
+            save_location_binary(temporary, locale, compression)
+        else:
+            save_location_json(temporary, locale, compression)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+    if os.path.exists(journal_filename(filename)):
+        os.remove(journal_filename(filename))
+    os.replace(temporary, filename)
+    locale.reset_changes()
 
 
 def load_location(filename: str) -> location.Location:
+    """
+    Loads location from a file of any format and compression
+    (both are detected from file header) and applies the journal of the file.
+    """
+    if detect_format(filename) == SaveFormat.binary:
+        locale = load_location_binary(filename)
+    else:
+        locale = load_location_json(filename)
 
-    # Get snapshot
-    with open(filename, mode="rt", encoding="utf-8") as file:
-        snapshot: Snapshot = json.load(file, object_hook=decoder)
+    if os.path.exists(journal_filename(filename)):
+        apply_journal(journal_filename(filename), locale)
+    locale.reset_changes()
+    return locale
+
+
+def form_location_snapshot(locale: location.Location, include_field: bool = True) -> Snapshot:
+    """
+    Forms location snapshot with meta data (version, state of location random, type) for saving.
+    Without the field, entities are left for the caller to save.
+    """
+    snapshot = Snapshot()
+    locale.fill_snapshot(snapshot, include_field)
+    snapshot.set_data(None, "version", str(version))
+    snapshot.set_data(None, "rand_state", locale.random.getstate())
+    snapshot.set_data(None, "type", type(locale))
+    return snapshot
+
+
+def location_from_snapshot(snapshot: Snapshot) -> location.Location:
+    """Checks version, creates location from a snapshot formed for saving and restores its random state"""
 
     # Version check
     file_version = literal_eval(snapshot.get_data(None, "version"))
     if version < file_version:
         raise VersionMismatchError(file_version, f"{version} or below")
 
+    # Location (created at its size and storage, so large sparse fields are never allocated densely)
+    location_type: type[location.Location] = snapshot.get_data(None, "type")
+    locale = location_type.create_empty(
+        snapshot.get_data(location.Location, "width"),
+        snapshot.get_data(location.Location, "height"),
+        snapshot.get_data(location.Location, "sparse", False)
+    )
+    locale.restore_from_snapshot(snapshot)
+
     # Random state
-    random.setstate(literal_eval(snapshot.get_data(None, "rand_state")))
+    locale.random.setstate(snapshot.get_data(None, "rand_state"))
+    return locale
+
+
+def random_state_from_json(value: str | list) -> tuple:
+    """Converts random state read from json (a list, or a string in files before 0.4.0) for Random.setstate()"""
+    if isinstance(value, str):
+        return literal_eval(value)
+    rand_version, rand_internal, rand_gauss = value
+    return rand_version, tuple(rand_internal), rand_gauss
+
+#endregion
+
+
+#region //// Compression
+
+# Save files of any format can be compressed as a whole.
+# Compression is picked by extension when saving and detected by magic bytes when loading.
+# Journals are never compressed.
+
+class Compression:
+    none: Final[str] = "none"
+    gzip: Final[str] = "gzip"
+    bz2: Final[str] = "bz2"
+    xz: Final[str] = "xz"
+    zstd: Final[str] = "zstd"
+    lz4: Final[str] = "lz4"
+
+
+compression_extensions: Final[dict[str, str]] = {
+    ".gz": Compression.gzip,
+    ".bz2": Compression.bz2,
+    ".xz": Compression.xz,
+    ".zst": Compression.zstd,
+    ".lz4": Compression.lz4
+}
+
+compression_magics: Final[dict[bytes, str]] = {
+    b"\x1f\x8b": Compression.gzip,
+    b"BZh": Compression.bz2,
+    b"\xfd7zXZ\x00": Compression.xz,
+    b"\x28\xb5\x2f\xfd": Compression.zstd,
+    b"\x04\x22\x4d\x18": Compression.lz4
+}
+
+# Compression -> open(filename, mode, **kwargs) function. zstd and lz4 are optional.
+compression_openers: Final[dict[str, Callable[..., IO]]] = {
+    Compression.none: open,
+    Compression.gzip: gzip.open,
+    Compression.bz2: bz2.open,
+    Compression.xz: lzma.open
+}
+
+try:
+    from compression import zstd  # Python 3.14+
+    compression_openers[Compression.zstd] = zstd.open
+except ImportError:
+    try:
+        import zstandard
+        compression_openers[Compression.zstd] = zstandard.open
+    except ImportError:
+        pass
+
+try:
+    import lz4.frame
+    compression_openers[Compression.lz4] = lz4.frame.open
+except ImportError:
+    pass
+
+
+def compression_from_extension(filename: str) -> str:
+    return compression_extensions.get(os.path.splitext(filename)[1].lower(), Compression.none)
+
+
+def detect_compression(filename: str) -> str:
+    """Returns compression of an existing file"""
+    with open(filename, mode="rb") as file:
+        header = file.read(max(len(magic) for magic in compression_magics))
+    for magic, compression in compression_magics.items():
+        if header.startswith(magic): return compression
+    return Compression.none
+
+
+def open_save_file(filename: str, mode: str, compression: str | None = None) -> IO:
+    """
+    Opens a save file in a binary or text (utf-8) mode, (de)compressing it on the fly.
+    If compression is not given, it is detected from file header when reading
+    and picked by file extension when writing.
+    """
+    if compression is None:
+        compression = detect_compression(filename) if "r" in mode else compression_from_extension(filename)
+
+    opener = compression_openers.get(compression)
+    if opener is None:
+        raise ValueError(f"Compression {compression} is not available (its module is not installed)")
+
+    if "t" in mode:
+        return opener(filename, mode, encoding="utf-8")
+    return opener(filename, mode)
+
+#endregion
+
+
+#region //// Journal
+
+# A journal is an append-only file next to the save file (json lines).
+# Each entry holds cells changed by a command, spawning toggle and random state after the command.
+# Loading applies entries on top of the save file in order.
+
+journal_suffix: Final[str] = ".journal"
+journal_max_entries: Final[int] = 64
+
+
+def journal_filename(filename: str) -> str:
+    return filename + journal_suffix
+
+
+def journal_length(filename: str) -> int:
+    """Returns amount of entries in the journal of a save file"""
+    if not os.path.exists(journal_filename(filename)): return 0
+    with open(journal_filename(filename), mode="rt", encoding="utf-8") as file:
+        return sum(1 for line in file if line.strip() != "")
+
+
+def save_location_delta(
+        filename: str,
+        locale: location.Location,
+        save_format: str = SaveFormat.json,
+        max_entries: int = journal_max_entries
+):
+    """
+    Appends changes since last save or load to the journal of the file.
+    Saves the whole location instead if the whole field has changed,
+    the file does not exist or is in other format, or the journal is full.
+    Appends nothing if nothing has changed.
+
+    A step changes the whole field, so only placements and spawning toggles are journaled,
+    any step leads to a whole save.
+    """
+    changed = locale.changed_positions()
+    if changed is None \
+            or not is_paths_exists(filename) \
+            or detect_format(filename) != save_format:
+        save_location(filename, locale, save_format)
+        return
+
+    # Nothing to journal
+    if not locale.has_changes():
+        return
+
+    if journal_length(filename) >= max_entries:
+        save_location(filename, locale, save_format)
+        return
+
+    entry = {
+        "cells": [[x, y, locale.form_entity_snapshot(locale[x, y])] for x, y in sorted(changed)],
+        "doSpawn": locale.spawning_enabled,
+        "rand_state": locale.random.getstate()
+    }
+
+    with open(journal_filename(filename), mode="at", encoding="utf-8") as file:
+        file.write(json.dumps(entry, default=encoder))
+        file.write("\n")
+
+    locale.reset_changes()
+
+
+def apply_journal(journal: str, locale: location.Location):
+    with open(journal, mode="rt", encoding="utf-8") as file:
+        for line in file:
+            if line.strip() == "": continue
+            entry = json.loads(line, object_hook=decoder)
+
+            for x, y, entity_snapshot in entry["cells"]:
+                locale.restore_entity_from_snapshot(x, y, entity_snapshot)
+
+            locale.spawning_enabled = entry["doSpawn"]
+
+            locale.random.setstate(random_state_from_json(entry["rand_state"]))
+
+
+def compact_location(filename: str, save_format: str | None = None):
+    """Merges the journal into the save file"""
+    if save_format is None:
+        save_format = detect_format(filename)
+    save_location(filename, load_location(filename), save_format)
+
+#endregion
+
+
+#region //// Json format
+
+# Layout (one json document, written and read line by line):
+#   {"snapshot": location snapshot without field, "field": [
+#   one line per row, with a trailing comma on all rows but the last
+#   ]}
+#
+# A row is a list of entity snapshots and numbers,
+# a number is a run of that many empty cells.
+# Files before 0.5.0 are a single (indented) snapshot with the whole field.
+
+json_stream_head: Final[str] = '{"snapshot": '
+json_stream_field: Final[str] = ', "field": [\n'
+json_stream_tail: Final[str] = ']}\n'
+
+
+def json_field_rows(locale: location.Location) -> Iterator[list[int | Snapshot]]:
+    """Yields rows of the field with runs of empty cells collapsed into numbers"""
+    width = locale.width
+    row: list[int | Snapshot] = []
+    row_y = 0
+    next_x = 0  # First cell of the row not written yet
+
+    for x, y, entity in locale.occupied():
+
+        # Finish rows before the entity
+        while row_y < y:
+            if next_x < width: row.append(width - next_x)
+            yield row
+            row, row_y, next_x = [], row_y + 1, 0
+
+        if next_x < x: row.append(x - next_x)
+        row.append(locale.form_entity_snapshot(entity))
+        next_x = x + 1
+
+    # Finish rows after the last entity
+    while row_y < locale.height:
+        if next_x < width: row.append(width - next_x)
+        yield row
+        row, row_y, next_x = [], row_y + 1, 0
+
+
+def save_location_json(filename: str, locale: location.Location, compression: str | None = None):
+
+    # Get snapshot
+    snapshot = form_location_snapshot(locale, include_field=False)
+
+    with open_save_file(filename, "wt", compression) as file:
+        file.write(json_stream_head)
+        file.write(json.dumps(snapshot, default=encoder))
+        file.write(json_stream_field)
+
+        for y, row in enumerate(json_field_rows(locale)):
+            file.write(json.dumps(row, default=encoder))
+            file.write(",\n" if y < locale.height - 1 else "\n")
+
+        file.write(json_stream_tail)
+
+
+def load_location_json(filename: str) -> location.Location:
+
+    with open_save_file(filename, "rt") as file:
+        head = file.readline()
+
+        # Older files
+        if not head.startswith(json_stream_head):
+            return load_location_json_whole(head + file.read())
+
+        # Get snapshot
+        snapshot: Snapshot = json.loads(
+            head.removeprefix(json_stream_head).removesuffix(json_stream_field),
+            object_hook=decoder
+        )
+        snapshot.set_data(None, "rand_state", random_state_from_json(snapshot.get_data(None, "rand_state")))
+        locale = location_from_snapshot(snapshot)
+
+        # Entities
+        for y, line in enumerate(file):
+            if y >= locale.height: break
+
+            x = 0
+            for item in json.loads(line.rstrip().removesuffix(","), object_hook=decoder):
+                if isinstance(item, int):
+                    x += item
+                else:
+                    locale.restore_entity_from_snapshot(x, y, item)
+                    x += 1
 
-    # Location
-    locale: location.Location = snapshot.get_data(None, "type")()
-    locale.restore_from_snapshot(snapshot)
     return locale
 
+
+def load_location_json_whole(text: str) -> location.Location:
+    """Loads location from contents of a file before 0.5.0 (whole snapshot in one json document)"""
+
+    # Get snapshot
+    snapshot: Snapshot = json.loads(text, object_hook=decoder)
+
+    snapshot.set_data(None, "rand_state", random_state_from_json(snapshot.get_data(None, "rand_state")))
+    return location_from_snapshot(snapshot)
+
+#endregion
+
+
+#region //// Binary format
+
+# Layout (little-endian):
+#   magic
+#   uint32 header length, header (json, location snapshot without field and random state, entity type schemas)
+#   random state: uint8 version, 625 * uint32 internal state, bool has gauss, double gauss
+#   per type in header order: uint32 count, count * uint32 cell indices, count * packed entity records
+#       (for sparse locations: uint32 count, count * uint32 x, count * uint32 y, count * packed entity records)
+#
+# An entity record is every value of its snapshot except its type,
+# packed with a per type struct built from the schema.
+
+binary_magic: Final[bytes] = b"ZPLB"
+
+# Kinds of snapshot values (schema) to struct formats
+binary_kind_int: Final[str] = "q"
+binary_kind_float: Final[str] = "d"
+binary_kind_bool: Final[str] = "?"
+binary_kind_pair: Final[str] = "p"   # list of 2 ints or None
+binary_kind_none: Final[str] = "n"   # always None
+
+binary_kind_formats: Final[dict[str, str]] = {
+    binary_kind_int: "q",
+    binary_kind_float: "d",
+    binary_kind_bool: "?",
+    binary_kind_pair: "?qq",
+    binary_kind_none: ""
+}
+
+binary_uint32_struct: Final[struct.Struct] = struct.Struct("<I")
+
+
+def binary_uint32_array(source: list[int] | bytes) -> array:
+    """Creates array of uint32 from ints or little-endian bytes"""
+    result = array("I") if array("I").itemsize == 4 else array("L")
+    if isinstance(source, bytes):
+        result.frombytes(source)
+        if sys.byteorder == "big": result.byteswap()
+    else:
+        result.extend(source)
+    return result
+
+
+def binary_uint32_array_to_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def binary_value_kind(value: Any) -> str:
+    if value is None: return binary_kind_none
+    if isinstance(value, bool): return binary_kind_bool
+    if isinstance(value, int): return binary_kind_int
+    if isinstance(value, float): return binary_kind_float
+    if isinstance(value, (list, tuple)) and len(value) == 2: return binary_kind_pair
+    raise TypeError(f"Value {value!r} can not be saved in binary format")
+
+
+def binary_merge_kinds(kind_a: str, kind_b: str) -> str:
+    if kind_a == kind_b: return kind_a
+    kinds = {kind_a, kind_b}
+    if kinds == {binary_kind_int, binary_kind_float}: return binary_kind_float
+    if kinds == {binary_kind_none, binary_kind_pair}: return binary_kind_pair
+    raise TypeError(f"Snapshot values of kinds {kind_a} and {kind_b} can not be saved under one key")
+
+
+def binary_pack_values(kinds: list[str], values: list[Any]) -> list[Any]:
+    packed = []
+    for kind, value in zip(kinds, values):
+        if kind == binary_kind_pair:
+            packed.extend((False, 0, 0) if value is None else (True, value[0], value[1]))
+        elif kind != binary_kind_none:
+            packed.append(value)
+    return packed
+
+
+def binary_unpack_values(kinds: list[str], packed: tuple[Any, ...]) -> list[Any]:
+    values = []
+    i = 0
+    for kind in kinds:
+        if kind == binary_kind_pair:
+            values.append([packed[i+1], packed[i+2]] if packed[i] else None)
+            i += 3
+        elif kind == binary_kind_none:
+            values.append(None)
+        else:
+            values.append(packed[i])
+            i += 1
+    return values
+
+
+def save_location_binary(filename: str, locale: location.Location, compression: str | None = None):
+
+    # Get snapshot
+    snapshot = form_location_snapshot(locale, include_field=False)
+    rand_state = snapshot.data[type(None)].pop("rand_state")
+    sparse = locale.sparse
+
+    # Group entities by type, collect schemas
+    groups: dict[type, tuple[list[tuple[int, int]], list[Snapshot]]] = {}
+    schemas: dict[type, dict[tuple[type, str], str]] = {}  # type -> (class, key) -> kind
+
+    for x, y, entity in locale.occupied():
+        entity_type = type(entity)
+        entity_snapshot = entity.form_snapshot()
+        positions, snapshots = groups.setdefault(entity_type, ([], []))
+        positions.append((x, y))
+        snapshots.append(entity_snapshot)
+
+        schema = schemas.setdefault(entity_type, {})
+        for cls, lump in entity_snapshot.data.items():
+            for key, value in lump.items():
+                kind = binary_value_kind(value)
+                known = schema.get((cls, key))
+                schema[(cls, key)] = kind if known is None else binary_merge_kinds(known, kind)
+
+    # Header
+    header = {
+        "snapshot": snapshot,
+        "types": [
+            {
+                "name": dict_type_to_string[entity_type],
+                "fields": [[dict_type_to_string[cls], key, kind] for (cls, key), kind in schemas[entity_type].items()]
+            }
+            for entity_type in groups
+        ]
+    }
+    header_bytes = json.dumps(header, default=encoder).encode("utf-8")
+
+    with open_save_file(filename, "wb", compression) as file:
+        file.write(binary_magic)
+        file.write(binary_uint32_struct.pack(len(header_bytes)))
+        file.write(header_bytes)
+
+        # Random state
+        file.write(pack_random_state(rand_state))
+
+        # Entities
+        for entity_type, (positions, snapshots) in groups.items():
+            keys = list(schemas[entity_type].keys())
+            kinds = list(schemas[entity_type].values())
+            record = struct.Struct("<" + "".join(binary_kind_formats[kind] for kind in kinds))
+
+            file.write(binary_uint32_struct.pack(len(positions)))
+            if sparse:
+                file.write(binary_uint32_array_to_bytes(binary_uint32_array([x for x, _ in positions])))
+                file.write(binary_uint32_array_to_bytes(binary_uint32_array([y for _, y in positions])))
+            else:
+                indices = [y * locale.width + x for x, y in positions]
+                file.write(binary_uint32_array_to_bytes(binary_uint32_array(indices)))
+
+            buffer = bytearray(record.size * len(snapshots))
+            for n, entity_snapshot in enumerate(snapshots):
+                values = [entity_snapshot.data.get(cls, {}).get(key) for cls, key in keys]
+                record.pack_into(buffer, n * record.size, *binary_pack_values(kinds, values))
+            file.write(buffer)
+
+
+def load_location_binary(filename: str) -> location.Location:
+
+    with open_save_file(filename, "rb") as file:
+        data = file.read()
+
+    if data[:len(binary_magic)] != binary_magic:
+        raise ValueError(f"{filename} is not a binary save file")
+    offset = len(binary_magic)
+
+    # Header
+    header_length, = binary_uint32_struct.unpack_from(data, offset)
+    offset += binary_uint32_struct.size
+    header = json.loads(data[offset:offset + header_length].decode("utf-8"), object_hook=decoder)
+    offset += header_length
+
+    snapshot: Snapshot = header["snapshot"]
+
+    # Random state
+    snapshot.set_data(None, "rand_state", unpack_random_state(data, offset))
+    offset += random_state_struct.size
+
+    # Entities
+    width = snapshot.get_data(location.Location, "width")
+    height = snapshot.get_data(location.Location, "height")
+    sparse = snapshot.get_data(location.Location, "sparse", False)
+    cells: list[list] = []
+
+    for type_info in header["types"]:
+        entity_type = dict_string_to_type[type_info["name"]]
+        keys = [(dict_string_to_type[cls_name], key) for cls_name, key, _ in type_info["fields"]]
+        kinds = [kind for _, _, kind in type_info["fields"]]
+        record = struct.Struct("<" + "".join(binary_kind_formats[kind] for kind in kinds))
+
+        count, = binary_uint32_struct.unpack_from(data, offset)
+        offset += binary_uint32_struct.size
+
+        if sparse:
+            xs = binary_uint32_array(data[offset:offset + count * 4])
+            ys = binary_uint32_array(data[offset + count * 4:offset + count * 8])
+            offset += count * 8
+        else:
+            indices = binary_uint32_array(data[offset:offset + count * 4])
+            xs = [i % width for i in indices]
+            ys = [i // width for i in indices]
+            offset += count * 4
+
+        records = struct.iter_unpack(record.format, data[offset:offset + count * record.size]) \
+            if record.size > 0 else (() for _ in range(count))
+        offset += count * record.size
+
+        for x, y, packed in zip(xs, ys, records):
+            entity_snapshot = Snapshot()
+            for (cls, key), value in zip(keys, binary_unpack_values(kinds, packed)):
+                entity_snapshot.set_data(cls, key, value)
+            entity_snapshot.set_data(None, "type", entity_type)
+            cells.append([x, y, entity_snapshot])
+
+    if sparse:
+        snapshot.set_data(location.Location, "cells", cells)
+    else:
+        field: list[Snapshot | None] = [None] * (width * height)
+        for x, y, entity_snapshot in cells:
+            field[y * width + x] = entity_snapshot
+        snapshot.set_data(location.Location, "field", field)
+    return location_from_snapshot(snapshot)
+
+#endregion
+
+
+#region //// Field file
+
+# A fixed layout copy of the field (FieldColumns), made to be memory mapped:
+# rendering and population queries read it without creating entities.
+# It is an export, locations are not loaded from it.
+#
+# Layout (little-endian):
+#   magic
+#   uint32 header length, header (json: version, width, height, steps, entity type names in type code order)
+#   every column of FieldColumns.column_typecodes in order, each starting at a multiple of 8 bytes
+
+field_file_magic: Final[bytes] = b"ZPLF"
+field_file_alignment: Final[int] = 8
+
+
+def field_file_padding(offset: int) -> bytes:
+    return bytes(-offset % field_file_alignment)
+
+
+def save_field_file(filename: str, locale: location.Location):
+    """Writes the field of a dense location into a field file (sparse fields would take memory per cell)"""
+    if locale.sparse:
+        raise ValueError("sparse locations can not be written into a field file")
+    columns = FieldColumns.from_location(locale)
+
+    header = {
+        "version": str(version),
+        "width": columns.width,
+        "height": columns.height,
+        "steps": locale.steps_performed,
+        "types": [dict_type_to_string[entity_type] for entity_type in columns.type_table]
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    with open(filename, mode="wb") as file:
+        file.write(field_file_magic)
+        file.write(binary_uint32_struct.pack(len(header_bytes)))
+        file.write(header_bytes)
+        offset = len(field_file_magic) + binary_uint32_struct.size + len(header_bytes)
+
+        for name, typecode in FieldColumns.column_typecodes:
+            file.write(field_file_padding(offset))
+            offset += len(field_file_padding(offset))
+
+            column = getattr(columns, name)
+            if sys.byteorder == "big":
+                column = array(typecode, column)
+                column.byteswap()
+            data = column.tobytes()
+            file.write(data)
+            offset += len(data)
+
+
+class FieldFileView:
+    """
+    A field file mapped into memory (read only).
+    Columns read straight from the file, entities are never created.
+    Close (or use as a context manager) to unmap the file.
+    """
+
+    columns: FieldColumns
+    steps: int
+
+    __map: mmap.mmap | None
+    __views: list[memoryview]
+
+    def __init__(self, filename: str):
+        """Raises ValueError if the file is not a whole field file"""
+        with open(filename, mode="rb") as file:
+            if os.fstat(file.fileno()).st_size < len(field_file_magic) + binary_uint32_struct.size:
+                raise ValueError(f"{filename} is not a field file")
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__views = []
+
+        try:
+            self.__read(filename)
+        except Exception:
+            self.close()
+            raise
+
+    def __read(self, filename: str):
+        data = self.__map
+
+        if data[:len(field_file_magic)] != field_file_magic:
+            raise ValueError(f"{filename} is not a field file")
+        offset = len(field_file_magic)
+
+        # Header
+        header_length, = binary_uint32_struct.unpack_from(data, offset)
+        offset += binary_uint32_struct.size
+        if offset + header_length > len(data):
+            raise ValueError(f"{filename} is truncated")
+        header = json.loads(data[offset:offset + header_length].decode("utf-8"))
+        offset += header_length
+
+        file_version = literal_eval(header["version"])
+        if version < file_version:
+            raise VersionMismatchError(file_version, f"{version} or below")
+
+        width, height = header["width"], header["height"]
+        self.steps = header["steps"]
+
+        # Columns (copied when byte order differs)
+        whole = memoryview(data)
+        self.__views.append(whole)
+        columns = {}
+        for name, typecode in FieldColumns.column_typecodes:
+            offset += len(field_file_padding(offset))
+            size = array(typecode).itemsize * width * height
+            if offset + size > len(data):
+                raise ValueError(f"{filename} is truncated")
+
+            view = whole[offset:offset + size]
+            self.__views.append(view)
+            if sys.byteorder == "big":
+                column = array(typecode, view.tobytes())
+                column.byteswap()
+            else:
+                column = view.cast(typecode)
+                self.__views.append(column)
+            columns[name] = column
+            offset += size
+
+        self.columns = FieldColumns.from_columns(
+            width, height,
+            [dict_string_to_type[name] for name in header["types"]],
+            **columns
+        )
+
+    def close(self):
+        for view in reversed(self.__views):
+            view.release()
+        self.__views = []
+
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+    def __enter__(self) -> "FieldFileView":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
 #endregion
 
 
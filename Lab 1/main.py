@@ -1,7 +1,15 @@
+import argparse
+import signal
+import sys
+import time
+
+import batch
 import commands
 import fileio
 import zeroplayer
 from utils.exceptions import InvalidInputError
+from utils.profiler import StepProfile
+from zeroplayer.metrics import MetricsRecorder, CsvMetricsSink, population_types
 
 
 def main():
@@ -12,6 +20,12 @@ def main():
     parser.register_subcommand(commands.place.SubcommandPlace())
     parser.register_subcommand(commands.step.SubcommandStep())
     parser.register_subcommand(commands.natural_spawn.SubcommandNaturalSpawn())
+    parser.register_subcommand(commands.serve.SubcommandServe())
+    parser.register_subcommand(commands.compact.SubcommandCompact())
+    parser.register_subcommand(commands.batch.SubcommandBatch())
+    parser.register_subcommand(commands.watch.SubcommandWatch())
+    parser.register_subcommand(commands.export.SubcommandExport())
+    parser.register_subcommand(commands.inspect.SubcommandInspect())
 
     arguments = parser.parse()
 
@@ -19,22 +33,131 @@ def main():
     if not fileio.is_path_exists_or_creatable(arguments.filename):
         raise InvalidInputError("invalid filename")
 
+    # Batch (Writes results, no simulation file involved)
+    if arguments.subcommand == commands.base.SubcommandName.batch:
+        if arguments.seed_last < arguments.seed_first:
+            raise InvalidInputError("invalid seed range")
+        if arguments.batch_steps < 0:
+            raise InvalidInputError("invalid step count")
+        if arguments.workers is not None and arguments.workers < 1:
+            raise InvalidInputError("invalid worker count")
+
+        batch.run_batch(
+            arguments.filename,
+            range(arguments.seed_first, arguments.seed_last + 1),
+            arguments.batch_steps,
+            arguments.workers
+        )
+        return
+
+    # Inspect (Reads a field file in place, no simulation file involved)
+    if arguments.subcommand == commands.base.SubcommandName.inspect:
+        if not fileio.is_paths_exists(arguments.filename):
+            raise InvalidInputError("no field file found")
+        inspect(arguments.filename, not arguments.flag_uncolored)
+        return
+
     # New (Will immediately save)
     if arguments.subcommand == commands.base.SubcommandName.new:
+        width, height = arguments.size or (None, None)
+        if arguments.size is not None and (width < 1 or height < 1):
+            raise InvalidInputError("invalid field size")
+
         fileio.save_location(
             arguments.filename,
-            zeroplayer.animals.location.WoodlandEdge(arguments.create_empty)
+            zeroplayer.animals.location.WoodlandEdge(
+                arguments.create_empty,
+                sparse=arguments.sparse,
+                width=width,
+                height=height
+            ),
+            arguments.save_format or fileio.SaveFormat.json
         )
 
     # Load
     if not fileio.is_paths_exists(arguments.filename):
         raise InvalidInputError("no simulation created. Use 'new' to create a new simulation.")
 
+    save_format = arguments.save_format or fileio.detect_format(arguments.filename)
+
+    # Compact (Saves on its own)
+    if arguments.subcommand == commands.base.SubcommandName.compact:
+        fileio.compact_location(arguments.filename, save_format)
+        return
+
     location = fileio.load_location(arguments.filename)
 
+    # Print check (before anything changes, so a failure does not lose the changes)
+    if arguments.flag_print or arguments.subcommand == commands.base.SubcommandName.nocommand:
+        zeroplayer.display.check_renderable(location)
+
+    # Export (Writes the field file only)
+    if arguments.subcommand == commands.base.SubcommandName.export:
+        if not fileio.is_path_exists_or_creatable(arguments.export_filename):
+            raise InvalidInputError("invalid field filename")
+        if location.sparse:
+            raise InvalidInputError("sparse locations can not be exported (field files take memory per cell)")
+        fileio.save_field_file(arguments.export_filename, location)
+        return
+
+    # Profiling
+    if arguments.flag_profile:
+        location.profile = StepProfile()
+
+    # Metrics
+    if arguments.metrics_filename is not None:
+        if not fileio.is_path_exists_or_creatable(arguments.metrics_filename):
+            raise InvalidInputError("invalid metrics filename")
+
+        location.metrics = MetricsRecorder(
+            CsvMetricsSink(
+                arguments.metrics_filename,
+                MetricsRecorder.columns([fileio.dict_type_to_string[t] for t in population_types])
+            ),
+            population_types
+        )
+
+    # Serve (saves on its own)
+    if arguments.subcommand == commands.base.SubcommandName.serve:
+        serve(location, arguments.filename, save_format, arguments.checkpoint_steps)
+        print_profile(location)
+        close_metrics(location)
+        return
+
+    # Watch
+    if arguments.subcommand == commands.base.SubcommandName.watch:
+        watch(
+            location,
+            arguments.watch_steps,
+            arguments.steps_per_second,
+            arguments.frames_per_second,
+            not arguments.flag_uncolored
+        )
+
+    # Natural spawn, Step, Place
+    perform_subcommand(location, arguments)
+    print_profile(location)
+    close_metrics(location)
+
+    # Print
+    if arguments.flag_print or arguments.subcommand == commands.base.SubcommandName.nocommand:
+        zeroplayer.display.print_location(
+            location,
+            not arguments.flag_uncolored
+        )
+
+    # Save (creating and printing change nothing, unless the file is converted to other format)
+    if arguments.subcommand not in (commands.base.SubcommandName.new, commands.base.SubcommandName.nocommand) \
+            or save_format != fileio.detect_format(arguments.filename):
+        fileio.save_location_delta(arguments.filename, location, save_format)
+
+
+def perform_subcommand(location: zeroplayer.location.Location, arguments: argparse.Namespace) -> None:
+    """Performs subcommands that change the location: natural spawn toggle, step and place"""
+
     # Natural spawn toggle
     if arguments.subcommand == commands.base.SubcommandName.natural_spawn:
-        toggle: bool = commands.natural_spawn.SubcommandNaturalSpawn.dict_param_to_bool[arguments.natural_lock]
+        toggle: bool = commands.natural_spawn.SubcommandNaturalSpawn.dict_param_to_bool[arguments.lock_state]
         location.spawning_enabled = toggle
 
     # Step
@@ -55,15 +178,159 @@ def main():
         entity = commands.place.SubcommandPlace.dict_param_to_type[arguments.entity_type]()
         entity.place_at(location, arguments.x, arguments.y)
 
-    # Print
-    if arguments.flag_print or arguments.subcommand == commands.base.SubcommandName.nocommand:
-        zeroplayer.display.print_location(
-            location,
-            not arguments.flag_uncolored
-        )
 
-    # Save
-    fileio.save_location(arguments.filename, location)
+def inspect(filename: str, render_colored: bool) -> None:
+    """Prints the field and population of a field file, without creating entities"""
+    try:
+        view = fileio.FieldFileView(filename)
+    except ValueError as error:
+        raise InvalidInputError(f"{error} (field files are written by 'export')")
+
+    with view:
+        sys.stdout.write(zeroplayer.display.render_columns(view.columns, render_colored))
+        print(f"step {view.steps}")
+        for entity_type, count in view.columns.population().items():
+            print(f"{fileio.dict_type_to_string[entity_type]}: {count}")
+
+
+def print_profile(location: zeroplayer.location.Location) -> None:
+    """Prints timings collected while stepping, if profiling is enabled"""
+    if location.profile is None: return
+    print(location.profile.report())
+
+
+def close_metrics(location: zeroplayer.location.Location) -> None:
+    """Writes out recorded metrics, if recording is enabled"""
+    if location.metrics is None: return
+    location.metrics.close()
+    location.metrics = None
+
+
+def serve(location: zeroplayer.location.Location, filename: str, save_format: str, checkpoint_steps: int) -> None:
+    """
+    Performs commands read from stdin (one per line) on a location kept in memory.
+    Saves on 'save' command and every checkpoint_steps performed steps (if positive).
+    """
+
+    if checkpoint_steps < 0:
+        raise InvalidInputError("invalid checkpoint interval")
+
+    parser = commands.serve.ServeCommandParser((
+        commands.place.SubcommandPlace(),
+        commands.step.SubcommandStep(),
+        commands.natural_spawn.SubcommandNaturalSpawn(),
+        commands.serve.SubcommandServePrint(),
+        commands.serve.SubcommandServeSave(),
+        commands.serve.SubcommandServeQuit()
+    ))
+
+    steps_since_save = 0
+
+    for line in sys.stdin:
+        if line.strip() == "": continue
+
+        try:
+            arguments = parser.parse_line(line)
+
+            # Quit
+            if arguments.subcommand == commands.base.SubcommandName.serve_quit:
+                break
+
+            # Save
+            elif arguments.subcommand == commands.base.SubcommandName.serve_save:
+                fileio.save_location_delta(filename, location, save_format)
+                steps_since_save = 0
+
+            # Print
+            elif arguments.subcommand == commands.base.SubcommandName.serve_print:
+                zeroplayer.display.print_location(location, not arguments.flag_uncolored)
+
+            # Natural spawn, Step, Place
+            else:
+                perform_subcommand(location, arguments)
+
+                # Checkpoint
+                if arguments.subcommand == commands.base.SubcommandName.step:
+                    steps_since_save += arguments.step_count
+                    if 0 < checkpoint_steps <= steps_since_save:
+                        fileio.save_location_delta(filename, location, save_format)
+                        steps_since_save = 0
+
+        except InvalidInputError as ex:
+            print(f"error: {ex}")
+
+        # Keep serving (the state is still in memory) if saving failed
+        except OSError as ex:
+            print(f"error: could not save: {ex}")
+
+        print("ok", flush=True)
+
+
+def watch(
+        location: zeroplayer.location.Location,
+        steps_limit: int,
+        steps_per_second: float,
+        frames_per_second: float,
+        render_colored: bool
+) -> None:
+    """
+    Steps the location and redraws it in place until steps_limit steps are performed (if positive)
+    or until interrupted. Steps and redraws are scheduled independently, only changed cells are redrawn.
+    An interrupt (Ctrl+C) is handled between steps, so a step is never left half performed.
+    """
+
+    if steps_limit < 0:
+        raise InvalidInputError("invalid step count")
+    if steps_per_second <= 0 or frames_per_second <= 0:
+        raise InvalidInputError("invalid rate")
+
+    display = zeroplayer.display
+    display.check_renderable(location)
+    step_interval = 1 / steps_per_second
+    frame_interval = 1 / frames_per_second
+
+    steps = 0
+    previous_cells = None
+    next_step = next_frame = time.perf_counter()
+
+    def redraw():
+        nonlocal previous_cells
+        cells = display.location_cells(location)
+        sys.stdout.write(display.render_cells_diff(previous_cells, cells, location.width, render_colored))
+        sys.stdout.write(display.cursor_to(location.height, 0) + f"step {steps}")
+        sys.stdout.flush()
+        previous_cells = cells
+
+    interrupted = False
+
+    def interrupt(signum, frame):
+        nonlocal interrupted
+        interrupted = True
+
+    previous_handler = signal.signal(signal.SIGINT, interrupt)
+    sys.stdout.write(display.screen_clear + display.cursor_hide)
+    try:
+        while not interrupted and (steps_limit == 0 or steps < steps_limit):
+            now = time.perf_counter()
+
+            # Step (does not catch up after falling behind)
+            if now >= next_step:
+                location.step()
+                steps += 1
+                next_step = max(next_step + step_interval, now)
+
+            # Redraw
+            if now >= next_frame:
+                redraw()
+                next_frame = max(next_frame + frame_interval, now)
+
+            time.sleep(max(0.0, min(next_step, next_frame) - time.perf_counter()))
+
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+        redraw()
+        sys.stdout.write(display.cursor_show + "\n")
+        sys.stdout.flush()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,7 @@
+from typing import Final
+
+
+# Names of save file formats, shared by file io and argument parsing
+class SaveFormat:
+    json: Final[str] = "json"
+    binary: Final[str] = "binary"
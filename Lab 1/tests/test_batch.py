@@ -0,0 +1,37 @@
+import csv
+import os
+import tempfile
+import unittest
+
+import batch
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_run_batch(self):
+        seeds, steps = range(3, 5), 4
+
+        with tempfile.TemporaryDirectory() as directory:
+            results = []
+            for run in range(2):
+                filename = os.path.join(directory, f"batch{run}.csv")
+                batch.run_batch(filename, seeds, steps, workers=1)
+                with open(filename, mode="rt", encoding="utf-8", newline="") as file:
+                    results.append(list(csv.reader(file)))
+
+        # Same seeds - same rows
+        self.assertEqual(results[0], results[1])
+
+        header, *rows = results[0]
+        self.assertEqual(header[:2], ["seed", "step"])
+        self.assertEqual(len(header), 2 + len(batch.population_types))
+        self.assertEqual(len(rows), len(seeds) * (steps + 1))
+
+        for seed in seeds:
+            expected = [[str(seed), str(step)] + [str(count) for count in counts]
+                        for step, counts in enumerate(batch.run_population(seed, steps))]
+            self.assertEqual([row for row in rows if row[0] == str(seed)], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,351 @@
+import json
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+import fileio
+from zeroplayer import display
+from zeroplayer.location import Location
+from zeroplayer.animals import plants, herbivores, carnivores
+from zeroplayer.animals.location import WoodlandEdge
+
+
+def stepped_location(seed: int, sparse: bool = False, steps: int = 3) -> WoodlandEdge:
+    locale = WoodlandEdge(seed=seed, sparse=sparse)
+    for _ in range(steps):
+        locale.step()
+    return locale
+
+
+def snapshot_text(locale: Location) -> str:
+    return json.dumps(fileio.form_location_snapshot(locale), default=fileio.encoder, sort_keys=True)
+
+
+class TestFileIO(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "world.sav")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameLocation(self, loaded: Location, original: Location):
+        self.assertIs(type(loaded), type(original))
+        self.assertEqual(loaded.sparse, original.sparse)
+        self.assertEqual(snapshot_text(loaded), snapshot_text(original))
+        self.assertEqual(loaded.random.getstate(), original.random.getstate())
+
+    #region //// Location types and sizes
+
+    def test_sizes(self):
+        large = WoodlandEdge(seed=1, sparse=True, width=100_000, height=50_000)
+        large.step()
+        plain = Location(7, 4, seed=2)
+        plants.Grass().place_at(plain, 6, 3)
+
+        for locale in (large, plain):
+            for save_format in (fileio.SaveFormat.binary, fileio.SaveFormat.json):
+                with self.subTest(size=(locale.width, locale.height), save_format=save_format):
+                    fileio.save_location(self.filename, locale, save_format)
+                    loaded = fileio.load_location(self.filename)
+                    self.assertEqual((loaded.width, loaded.height), (locale.width, locale.height))
+                    self.assertSameLocation(loaded, locale)
+
+    #endregion
+
+    #region //// Json format
+
+    def test_json_round_trip(self):
+        for sparse in (False, True):
+            with self.subTest(sparse=sparse):
+                locale = stepped_location(8, sparse)
+                fileio.save_location(self.filename, locale, fileio.SaveFormat.json)
+                self.assertEqual(fileio.detect_format(self.filename), fileio.SaveFormat.json)
+                self.assertSameLocation(fileio.load_location(self.filename), locale)
+
+    def test_json_rows(self):
+        locale = Location(4, 3, seed=1)
+        plants.Grass().place_at(locale, 0, 0)
+        herbivores.Mouse().place_at(locale, 3, 2)  # Last column of the last row
+
+        rows = list(fileio.json_field_rows(locale))
+        self.assertEqual([[item for item in row if isinstance(item, int)] for row in rows], [[3], [4], [3]])
+        self.assertIsInstance(rows[0][0], fileio.Snapshot)
+        self.assertIsInstance(rows[2][1], fileio.Snapshot)
+
+        # A head line, a line per row, a tail line
+        fileio.save_location(self.filename, locale)
+        with open(self.filename, mode="rt", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        self.assertEqual(len(lines), 1 + locale.height + 1)
+        self.assertTrue(lines[0].startswith(fileio.json_stream_head))
+        self.assertEqual(lines[2], "[4],")
+        self.assertFalse(lines[3].endswith(","))
+        self.assertSameLocation(fileio.load_location(self.filename), locale)
+
+        # Whole field empty
+        locale.clear()
+        fileio.save_location(self.filename, locale)
+        self.assertSameLocation(fileio.load_location(self.filename), locale)
+
+    def test_json_before_0_5_0(self):
+        locale = stepped_location(9)
+
+        # Whole indented snapshot, random state as a string (as written by 0.2.0)
+        snapshot = fileio.form_location_snapshot(locale)
+        snapshot.set_data(None, "version", str((0, 2, 0)))
+        snapshot.set_data(None, "rand_state", str(locale.random.getstate()))
+        with open(self.filename, mode="wt", encoding="utf-8") as file:
+            json.dump(snapshot, file, default=fileio.encoder, indent="\t")
+
+        self.assertSameLocation(fileio.load_location(self.filename), locale)
+
+    #endregion
+
+    #region //// Binary format
+
+    def test_binary_round_trip(self):
+        for sparse in (False, True):
+            with self.subTest(sparse=sparse):
+                locale = stepped_location(1, sparse)
+                locale.random.gauss(0, 1)  # Random state with a kept gauss value
+
+                fileio.save_location(self.filename, locale, fileio.SaveFormat.binary)
+                self.assertEqual(fileio.detect_format(self.filename), fileio.SaveFormat.binary)
+                self.assertSameLocation(fileio.load_location(self.filename), locale)
+
+    def test_binary_groups(self):
+        locale = stepped_location(2)
+        fileio.save_location(self.filename, locale, fileio.SaveFormat.binary)
+
+        with open(self.filename, mode="rb") as file:
+            data = file.read()
+        self.assertTrue(data.startswith(fileio.binary_magic))
+        header_length, = fileio.binary_uint32_struct.unpack_from(data, len(fileio.binary_magic))
+        start = len(fileio.binary_magic) + fileio.binary_uint32_struct.size
+        header = json.loads(data[start:start + header_length], object_hook=fileio.decoder)
+
+        # One group per present type, every value of the snapshot has a kind
+        names = [type_info["name"] for type_info in header["types"]]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(
+            {fileio.dict_string_to_type[name] for name in names},
+            {type(entity) for entity in locale.entities()}
+        )
+        for type_info in header["types"]:
+            for _, _, kind in type_info["fields"]:
+                self.assertIn(kind, fileio.binary_kind_formats)
+
+        # Random state follows the header
+        state = fileio.unpack_random_state(data, start + header_length)
+        self.assertEqual(state, locale.random.getstate())
+
+    def test_binary_not_binary(self):
+        fileio.save_location(self.filename, stepped_location(3), fileio.SaveFormat.json)
+        with self.assertRaises(ValueError):
+            fileio.load_location_binary(self.filename)
+
+    def test_binary_value_kinds(self):
+        kinds = [fileio.binary_kind_int, fileio.binary_kind_float, fileio.binary_kind_pair, fileio.binary_kind_none]
+        values = [3, 0.5, [1, 2], None]
+        record = struct.Struct("<" + "".join(fileio.binary_kind_formats[kind] for kind in kinds))
+
+        packed = record.unpack(record.pack(*fileio.binary_pack_values(kinds, values)))
+        self.assertEqual(fileio.binary_unpack_values(kinds, packed), values)
+
+        self.assertEqual(fileio.binary_merge_kinds(fileio.binary_kind_int, fileio.binary_kind_float), fileio.binary_kind_float)
+        self.assertEqual(fileio.binary_merge_kinds(fileio.binary_kind_none, fileio.binary_kind_pair), fileio.binary_kind_pair)
+        with self.assertRaises(TypeError):
+            fileio.binary_merge_kinds(fileio.binary_kind_bool, fileio.binary_kind_pair)
+
+    #endregion
+
+    #region //// Journal
+
+    def test_journal_round_trip(self):
+        locale = stepped_location(4)
+        fileio.save_location(self.filename, locale)
+
+        plants.Grass().place_at(locale, 0, 0)
+        locale.spawning_enabled = False
+        fileio.save_location_delta(self.filename, locale)
+        herbivores.Mouse().place_at(locale, 1, 0)
+        fileio.save_location_delta(self.filename, locale)
+
+        self.assertEqual(fileio.journal_length(self.filename), 2)
+        self.assertSameLocation(fileio.load_location(self.filename), locale)
+
+    def test_journal_apply(self):
+        locale = stepped_location(5)
+        fileio.save_location(self.filename, locale)
+        base = fileio.load_location(self.filename)
+
+        carnivores.Fox().place_at(locale, 2, 1)
+        carnivores.Fox().place_at(locale, 3, 1)
+        locale.random.random()  # State after a command is journaled too
+        fileio.save_location_delta(self.filename, locale)
+
+        fileio.apply_journal(fileio.journal_filename(self.filename), base)
+        self.assertSameLocation(base, locale)
+
+    def test_journal_no_changes(self):
+        locale = stepped_location(5)
+        fileio.save_location(self.filename, locale)
+
+        fileio.save_location_delta(self.filename, locale)
+        self.assertFalse(os.path.exists(fileio.journal_filename(self.filename)))
+
+        # Loaded location is unchanged as well
+        fileio.save_location_delta(self.filename, fileio.load_location(self.filename))
+        self.assertFalse(os.path.exists(fileio.journal_filename(self.filename)))
+
+        # Toggling back and forth changes nothing either
+        locale.spawning_enabled = not locale.spawning_enabled
+        locale.spawning_enabled = not locale.spawning_enabled
+        fileio.save_location_delta(self.filename, locale)
+        self.assertFalse(os.path.exists(fileio.journal_filename(self.filename)))
+
+    def test_journal_whole_saves(self):
+        locale = stepped_location(6)
+        fileio.save_location(self.filename, locale)
+
+        # Steps change the whole field
+        locale.step()
+        fileio.save_location_delta(self.filename, locale)
+        self.assertFalse(os.path.exists(fileio.journal_filename(self.filename)))
+
+        # Full journal
+        for x in range(3):
+            plants.Grass().place_at(locale, x, 0)
+            fileio.save_location_delta(self.filename, locale, max_entries=2)
+        self.assertEqual(fileio.journal_length(self.filename), 0)
+        self.assertSameLocation(fileio.load_location(self.filename), locale)
+
+        # Other format
+        plants.Grass().place_at(locale, 4, 0)
+        fileio.save_location_delta(self.filename, locale, fileio.SaveFormat.binary)
+        self.assertEqual(fileio.detect_format(self.filename), fileio.SaveFormat.binary)
+        self.assertEqual(fileio.journal_length(self.filename), 0)
+
+    def test_compact(self):
+        locale = stepped_location(7)
+        fileio.save_location(self.filename, locale, fileio.SaveFormat.binary)
+        plants.Wheat().place_at(locale, 5, 5)
+        fileio.save_location_delta(self.filename, locale, fileio.SaveFormat.binary)
+
+        fileio.compact_location(self.filename)
+        self.assertFalse(os.path.exists(fileio.journal_filename(self.filename)))
+        self.assertFalse(os.path.exists(self.filename + fileio.save_temporary_suffix))
+        self.assertEqual(fileio.detect_format(self.filename), fileio.SaveFormat.binary)
+        self.assertSameLocation(fileio.load_location(self.filename), locale)
+
+    #endregion
+
+    #region //// Compression
+
+    def test_compression_round_trip(self):
+        locale = stepped_location(10)
+
+        for compression in (fileio.Compression.gzip, fileio.Compression.bz2, fileio.Compression.xz):
+            for save_format in (fileio.SaveFormat.json, fileio.SaveFormat.binary):
+                with self.subTest(compression=compression, save_format=save_format):
+                    fileio.save_location(self.filename, locale, save_format, compression)
+                    self.assertEqual(fileio.detect_compression(self.filename), compression)
+                    self.assertEqual(fileio.detect_format(self.filename), save_format)
+                    self.assertSameLocation(fileio.load_location(self.filename), locale)
+
+    def test_compression_by_extension(self):
+        filename = self.filename + ".xz"
+        fileio.save_location(filename, stepped_location(11))
+        self.assertEqual(fileio.detect_compression(filename), fileio.Compression.xz)
+
+        fileio.save_location(self.filename, stepped_location(11))
+        self.assertEqual(fileio.detect_compression(self.filename), fileio.Compression.none)
+
+    def test_compression_kept(self):
+        locale = stepped_location(12)
+        fileio.save_location(self.filename, locale, fileio.SaveFormat.json, fileio.Compression.gzip)
+
+        # Whole save after a step
+        locale.step()
+        fileio.save_location_delta(self.filename, locale)
+        self.assertEqual(fileio.detect_compression(self.filename), fileio.Compression.gzip)
+
+        # Compacting
+        plants.Grass().place_at(locale, 0, 0)
+        fileio.save_location_delta(self.filename, locale)
+        fileio.compact_location(self.filename)
+        self.assertEqual(fileio.detect_compression(self.filename), fileio.Compression.gzip)
+        self.assertSameLocation(fileio.load_location(self.filename), locale)
+
+    def test_compression_missing(self):
+        locale = stepped_location(13)
+        fileio.save_location(self.filename, locale, compression=fileio.Compression.gzip)
+
+        with mock.patch.dict(fileio.compression_openers):
+            del fileio.compression_openers[fileio.Compression.gzip]
+            with self.assertRaises(ValueError):
+                fileio.save_location(self.filename + "2", locale, compression=fileio.Compression.gzip)
+            with self.assertRaises(ValueError):
+                fileio.load_location(self.filename)
+            self.assertFalse(os.path.exists(self.filename + "2"))
+
+    #endregion
+
+    #region //// Field file
+
+    def test_field_file(self):
+        locale = stepped_location(14, steps=5)
+        fileio.save_field_file(self.filename, locale)
+
+        with fileio.FieldFileView(self.filename) as view:
+            columns = view.columns
+            self.assertEqual(view.steps, 5)
+            self.assertEqual((columns.width, columns.height), (locale.width, locale.height))
+            self.assertIsInstance(columns.type_codes, memoryview)
+
+            for render_colored in (False, True):
+                self.assertEqual(
+                    display.render_columns(columns, render_colored),
+                    display.render_location(locale, render_colored)
+                )
+            self.assertEqual(
+                columns.population(),
+                {entity_type: locale.count_of_type(entity_type) for entity_type in columns.type_table}
+            )
+
+        # Views are released on close
+        with self.assertRaises(ValueError):
+            len(columns.type_codes)
+
+    def test_field_file_rejected(self):
+        fileio.save_location(self.filename, stepped_location(15))
+        with self.assertRaises(ValueError):
+            fileio.FieldFileView(self.filename)
+
+        with self.assertRaises(ValueError):
+            fileio.save_field_file(self.filename, stepped_location(15, sparse=True))
+
+        # Empty and truncated files
+        open(self.filename, "wb").close()
+        with self.assertRaises(ValueError):
+            fileio.FieldFileView(self.filename)
+
+        fileio.save_field_file(self.filename, stepped_location(15))
+        with open(self.filename, "rb") as file:
+            data = file.read()
+        for size in (6, 20, len(data) - 1):
+            with self.subTest(size=size):
+                with open(self.filename, "wb") as file:
+                    file.write(data[:size])
+                with self.assertRaises(ValueError):
+                    fileio.FieldFileView(self.filename)
+
+    #endregion
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import main
+from save_formats import SaveFormat
+from utils.exceptions import InvalidInputError
+from zeroplayer.animals.location import WoodlandEdge
+
+
+class TestServe(unittest.TestCase):
+
+    def serve(self, filename: str, lines: list[str], checkpoint_steps: int = 0) -> tuple[WoodlandEdge, list[str]]:
+        locale = WoodlandEdge(seed=1)
+        output = io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO("".join(line + "\n" for line in lines))), redirect_stdout(output):
+            main.serve(locale, filename, SaveFormat.json, checkpoint_steps)
+        return locale, output.getvalue().splitlines()
+
+    def test_errors_keep_serving(self):
+        with tempfile.TemporaryDirectory() as directory:
+            unwritable = os.path.join(directory, "missing", "world.sav")
+            locale, output = self.serve(unwritable, ["step 2", "jump", "save", "step", "quit", "step"], 1)
+
+            self.assertEqual(locale.steps_performed, 3)
+            self.assertEqual(output.count("ok"), 4)
+            self.assertEqual(len([line for line in output if line.startswith("error: could not save")]), 3)
+            self.assertEqual(len([line for line in output if line.startswith("error: argument subcommand")]), 1)
+
+
+
+class TestSave(unittest.TestCase):
+
+    def run_main(self, *arguments: str) -> mock.MagicMock:
+        with mock.patch("sys.argv", ["main.py", *arguments]), \
+                mock.patch.object(main.fileio, "save_location_delta", wraps=main.fileio.save_location_delta) as save, \
+                redirect_stdout(io.StringIO()):
+            main.main()
+        return save
+
+    def test_only_changes_save(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "world.sav")
+
+            self.run_main(filename, "new").assert_not_called()
+            self.run_main("-p", filename, "new").assert_not_called()
+            self.run_main("-u", filename).assert_not_called()
+            self.run_main(filename, "step").assert_called_once()
+            self.assertFalse(os.path.exists(main.fileio.journal_filename(filename)))
+
+    def test_inspect_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "world.sav")
+            self.run_main(filename, "new")
+            with self.assertRaises(InvalidInputError):
+                self.run_main(filename, "inspect")
+
+            open(filename, "wb").close()
+            with self.assertRaises(InvalidInputError):
+                self.run_main(filename, "inspect")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
-from typing import Callable
-from queue import PriorityQueue
+from typing import Callable, Iterable
+from bisect import bisect_right, insort
 from enum import IntEnum
 from dataclasses import dataclass, field
 
@@ -21,18 +21,64 @@ class ActionPriorityItem:
 
 
 class ActionPriorityQueue:
-    """A priority queue of Callable actions"""
+    """
+    A priority queue of Callable actions.
+
+    Keeps one list (bucket) of actions per priority level
+    and drains the buckets in priority order.
+    Actions of the same priority are performed in FIFO order.
+
+    Not thread-safe.
+    """
 
-    __actions: PriorityQueue[ActionPriorityItem]
+    __buckets: dict[ActionPriority, list[Callable[[], None]]]
+    __priorities: list[ActionPriority]  # Sorted keys of buckets
 
-    def __init__(self):
-        self.__actions = PriorityQueue()
+    def __init__(self, priorities: Iterable[ActionPriority] = ()):
+        """
+        Creates an empty queue.
+        Buckets for given priorities are created up front,
+        others are created on first enqueue.
+        """
+        self.__buckets = dict()
+        self.__priorities = []
+        for priority in priorities:
+            self.__add_bucket(priority)
+
+    def __add_bucket(self, priority: ActionPriority) -> list[Callable[[], None]]:
+        bucket = []
+        self.__buckets[priority] = bucket
+        insort(self.__priorities, priority)
+        return bucket
 
     def enqueue(self, priority: ActionPriority, action: Callable[[], None]) -> None:
         """Enqueues an action with priority"""
-        self.__actions.put(ActionPriorityItem(priority, action))
+        bucket = self.__buckets.get(priority)
+        if bucket is None:
+            bucket = self.__add_bucket(priority)
+        bucket.append(action)
 
     def perform(self) -> None:
-        """Performs all actions from the queue, clearing the queue"""
-        while not self.__actions.empty():
-            self.__actions.get().action()
+        """
+        Performs all actions from the queue, clearing the queue.
+        Actions enqueued during perform are performed in the same call
+        unless their priority has already been drained.
+        """
+        priorities = self.__priorities
+        index = 0
+        while index < len(priorities):
+            priority = priorities[index]
+            bucket = self.__buckets[priority]
+
+            # Drain (bucket may grow while draining)
+            i = 0
+            while i < len(bucket):
+                bucket[i]()
+                i += 1
+            del bucket[:i]
+
+            # Next priority (new buckets may have been added)
+            index = bisect_right(priorities, priority)
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.__buckets.values())
@@ -0,0 +1,32 @@
+from typing import Callable, Any
+
+
+class ClassTableCache:
+    """
+    Caches values computed from classes.
+    A value is recomputed when any of the listed class attributes
+    has a different value than when it was computed.
+    """
+
+    __factory: Callable[[type], Any]
+    __attributes: tuple[str, ...]
+    __values: dict[type, tuple[tuple[Any, ...], Any]]  # class -> (attribute values, value)
+
+    def __init__(self, factory: Callable[[type], Any], *attributes: str):
+        self.__factory = factory
+        self.__attributes = attributes
+        self.__values = dict()
+
+    def get(self, cls: type) -> Any:
+        key = tuple(getattr(cls, name, None) for name in self.__attributes)
+
+        cached = self.__values.get(cls)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        value = self.__factory(cls)
+        self.__values[cls] = (key, value)
+        return value
+
+    def clear(self) -> None:
+        self.__values.clear()
@@ -0,0 +1,67 @@
+from typing import Any
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TimingStat:
+    calls: int = 0      # Times the measured thing was called (phases only)
+    actions: int = 0    # Actions performed within
+    time: float = 0.0   # Wall time, seconds
+
+
+@dataclass
+class StepProfile:
+    """
+    Timings collected while stepping.
+    Phases are named parts of a step, priorities and owners are of performed actions.
+    """
+
+    phases: dict[str, TimingStat] = field(default_factory=dict)
+    priorities: dict[Any, TimingStat] = field(default_factory=dict)
+    owners: dict[type, TimingStat] = field(default_factory=dict)
+
+    #region //// Recording
+
+    def record_phase(self, name: str, seconds: float, actions: int = 0) -> None:
+        stat = self.phases.setdefault(name, TimingStat())
+        stat.calls += 1
+        stat.actions += actions
+        stat.time += seconds
+
+    def record_action(self, priority: Any, owner: type, seconds: float) -> None:
+        stat = self.priorities.setdefault(priority, TimingStat())
+        stat.actions += 1
+        stat.time += seconds
+
+        stat = self.owners.setdefault(owner, TimingStat())
+        stat.actions += 1
+        stat.time += seconds
+
+    #endregion
+
+    #region //// Report
+
+    def report(self) -> str:
+        """Returns a human-readable table of collected timings"""
+
+        # Only phases count calls, priorities and classes count actions
+        def section(title: str, stats: dict[Any, TimingStat], name_of, with_calls: bool) -> list[str]:
+            calls_header = f"{'calls':>10}" if with_calls else ""
+            lines = [f"{title:<24}{calls_header}{'actions':>10}{'time, ms':>12}{'per action, us':>16}"]
+            for key, stat in sorted(stats.items(), key=lambda item: -item[1].time):
+                calls = f"{stat.calls:>10}" if with_calls else ""
+                per_action = f"{stat.time / stat.actions * 1e6:.2f}" if stat.actions > 0 else "-"
+                lines.append(
+                    f"{name_of(key):<24}{calls}{stat.actions:>10}{stat.time * 1000:>12.2f}{per_action:>16}"
+                )
+            return lines
+
+        lines = []
+        lines += section("phase", self.phases, str, True)
+        lines.append("")
+        lines += section("priority", self.priorities, lambda key: getattr(key, "name", str(key)), False)
+        lines.append("")
+        lines += section("class", self.owners, lambda key: key.__name__, False)
+        return "\n".join(lines)
+
+    #endregion
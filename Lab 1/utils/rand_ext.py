@@ -1,6 +1,31 @@
-from random import random
+from typing import Final
+import random as random_module
+import struct
 
 
-def chance(chance_of_true: float) -> bool:
-    """Returns true with a chance (float between 0 and 1, both inclusive)"""
-    return random() < chance_of_true
+def chance(chance_of_true: float, rng: random_module.Random = random_module) -> bool:
+    """
+    Returns true with a chance (float between 0 and 1, both inclusive).
+    Uses the global random unless a generator is given.
+    """
+    return rng.random() < chance_of_true
+
+
+#region //// State packing
+
+# Mersenne twister state of random.Random: version, 624 words and position, optional gauss value
+random_state_struct: Final[struct.Struct] = struct.Struct("<B625I?d")
+
+
+def pack_random_state(state: tuple) -> bytes:
+    """Packs state returned by random.Random.getstate() into bytes"""
+    version, internal, gauss = state
+    return random_state_struct.pack(version, *internal, gauss is not None, 0.0 if gauss is None else gauss)
+
+
+def unpack_random_state(data: bytes | memoryview, offset: int = 0) -> tuple:
+    """Unpacks state packed by pack_random_state, for random.Random.setstate()"""
+    values = random_state_struct.unpack_from(data, offset)
+    return values[0], values[1:626], values[627] if values[626] else None
+
+#endregion
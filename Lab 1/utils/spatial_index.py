@@ -0,0 +1,119 @@
+from typing import Hashable, Iterable
+
+
+class SpatialIndex:
+    """
+    Uniform bucket grid of integer positions, grouped by key.
+    Allows querying positions of given keys around a point
+    in time proportional to the number of positions nearby.
+    """
+
+    __bucket_size: int
+    __buckets: dict[Hashable, dict[tuple[int, int], set[tuple[int, int]]]]  # key -> bucket -> positions
+    __counts: dict[Hashable, int]
+
+    def __init__(self, bucket_size: int = 8):
+        if bucket_size < 1:
+            raise ValueError("bucket size must be positive")
+
+        self.__bucket_size = bucket_size
+        self.clear()
+
+    def clear(self) -> None:
+        """Removes all positions"""
+        self.__buckets = dict()
+        self.__counts = dict()
+
+    #region //// Modification
+
+    def add(self, key: Hashable, x: int, y: int) -> None:
+        buckets = self.__buckets.get(key)
+        if buckets is None:
+            buckets = dict()
+            self.__buckets[key] = buckets
+
+        bucket_key = (x // self.__bucket_size, y // self.__bucket_size)
+        bucket = buckets.get(bucket_key)
+        if bucket is None:
+            bucket = set()
+            buckets[bucket_key] = bucket
+
+        if (x, y) not in bucket:
+            bucket.add((x, y))
+            self.__counts[key] = self.__counts.get(key, 0) + 1
+
+    def remove(self, key: Hashable, x: int, y: int) -> None:
+        buckets = self.__buckets.get(key)
+        if buckets is None: return
+
+        bucket_key = (x // self.__bucket_size, y // self.__bucket_size)
+        bucket = buckets.get(bucket_key)
+        if bucket is None or (x, y) not in bucket: return
+
+        bucket.remove((x, y))
+        if len(bucket) == 0:
+            del buckets[bucket_key]
+        self.__counts[key] -= 1
+
+    #endregion
+
+    #region //// Queries
+
+    def count(self, key: Hashable) -> int:
+        """Returns amount of positions stored under a key"""
+        return self.__counts.get(key, 0)
+
+    def keys(self) -> list[Hashable]:
+        """Returns all keys with at least one position"""
+        return [key for key, count in self.__counts.items() if count > 0]
+
+    def positions(self, key: Hashable) -> list[tuple[int, int]]:
+        """Returns all positions stored under a key, in no particular order"""
+        return [pos for bucket in self.__buckets.get(key, {}).values() for pos in bucket]
+
+    def in_square(self, keys: Iterable[Hashable], x: int, y: int, radius: int) -> list[tuple[int, int]]:
+        """
+        Returns positions of given keys within the square
+        [x - radius; x + radius] x [y - radius; y + radius] (inclusive),
+        sorted by x, then by y.
+        """
+        size = self.__bucket_size
+        min_x, max_x = x - radius, x + radius
+        min_y, max_y = y - radius, y + radius
+        bucket_xs = range(min_x // size, max_x // size + 1)
+        bucket_ys = range(min_y // size, max_y // size + 1)
+
+        found = []
+        for key in keys:
+            buckets = self.__buckets.get(key)
+            if not buckets: continue
+
+            for bx in bucket_xs:
+                for by in bucket_ys:
+                    bucket = buckets.get((bx, by))
+                    if bucket is None: continue
+
+                    for pos in bucket:
+                        if min_x <= pos[0] <= max_x and min_y <= pos[1] <= max_y:
+                            found.append(pos)
+
+        found.sort()
+        return found
+
+    def nearest(self, keys: Iterable[Hashable], x: int, y: int, radius: int) -> tuple[int, int] | None:
+        """
+        Returns the closest (euclidean) position of given keys
+        within the square of radius around (x, y), excluding (x, y) itself.
+        Ties are broken by x, then by y. Returns None if nothing is found.
+        """
+        best = None
+        best_distance = 0
+        for pos in self.in_square(keys, x, y, radius):
+            if pos[0] == x and pos[1] == y: continue
+            distance = (pos[0] - x) ** 2 + (pos[1] - y) ** 2
+            if best is None or distance < best_distance:
+                best = pos
+                best_distance = distance
+        return best
+
+    #endregion
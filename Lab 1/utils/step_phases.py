@@ -0,0 +1,101 @@
+from typing import Callable, Iterable, Any
+from time import perf_counter
+
+from utils.action_queue import ActionPriority
+from utils.class_cache import ClassTableCache
+from utils.profiler import StepProfile
+
+
+def step_action(priority: ActionPriority) -> Callable[[Callable], Callable]:
+    """
+    Decorator.
+    Declares a method (taking only self) as a step action performed during the phase of given priority.
+    """
+    def decorator(method: Callable) -> Callable:
+        method.step_priority = priority
+        return method
+    return decorator
+
+
+def collect_step_actions(cls: type) -> tuple[tuple[ActionPriority, Callable[[Any], None]], ...]:
+    """
+    Returns (priority, function) of every step action of a class.
+    Actions of base classes come first, actions of a class are in definition order.
+    Overridden methods are resolved to the most derived ones, with their own priority.
+    """
+    names: dict[str, ActionPriority] = dict()
+    for klass in reversed(cls.__mro__):
+        for name, member in vars(klass).items():
+            priority = getattr(member, "step_priority", None)
+            if priority is not None and name not in names:
+                names[name] = priority
+
+    actions = []
+    for name, priority in names.items():
+        action = getattr(cls, name)
+        actions.append((getattr(action, "step_priority", priority), action))
+    return tuple(actions)
+
+
+class StepPhases:
+    """
+    Performs step actions of objects phase by phase (one phase per priority, in priority order).
+    Within a phase, objects act in the order they are given.
+
+    Actions are declared on classes with step_action,
+    tables of actions per class are built once.
+    """
+
+    __priorities: list[ActionPriority]  # Sorted
+    __tables: ClassTableCache           # class -> tuple of actions per phase
+
+    def __init__(self, priorities: Iterable[ActionPriority]):
+        self.__priorities = sorted(priorities)
+        self.__tables = ClassTableCache(self.__form_table)
+
+    @property
+    def priorities(self) -> list[ActionPriority]:
+        return list(self.__priorities)
+
+    def __form_table(self, cls: type) -> tuple[tuple[Callable[[Any], None], ...], ...]:
+        phases = {priority: [] for priority in self.__priorities}
+        for priority, action in collect_step_actions(cls):
+            if priority not in phases:
+                raise ValueError(f"{cls.__name__} declares an action with unknown priority {priority!r}")
+            phases[priority].append(action)
+        return tuple(tuple(phases[priority]) for priority in self.__priorities)
+
+    def table(self, cls: type) -> tuple[tuple[Callable[[Any], None], ...], ...]:
+        """Returns actions of a class per phase, aligned with priorities"""
+        return self.__tables.get(cls)
+
+    def count_actions(self, performers: Iterable[Any]) -> int:
+        """Returns amount of actions given objects perform over all phases"""
+        return sum(sum(len(actions) for actions in self.table(type(performer))) for performer in performers)
+
+    #region //// Performing
+
+    def perform(self, performers: list[Any]) -> None:
+        """Performs all phases over given objects"""
+        tables = [self.table(type(performer)) for performer in performers]
+
+        for phase in range(len(self.__priorities)):
+            for performer, table in zip(performers, tables):
+                for action in table[phase]:
+                    action(performer)
+
+    def perform_profiled(self, performers: list[Any], profile: StepProfile) -> None:
+        """
+        Same as perform, recording time of every action
+        under its priority and the class of its performer.
+        """
+        tables = [self.table(type(performer)) for performer in performers]
+
+        for phase, priority in enumerate(self.__priorities):
+            for performer, table in zip(performers, tables):
+                for action in table[phase]:
+                    start = perf_counter()
+                    action(performer)
+                    profile.record_action(priority, type(performer), perf_counter() - start)
+
+    #endregion
@@ -54,6 +54,32 @@ class TestActionPriorityQueue(unittest.TestCase):
         queue.perform()
         self.assertEqual(p.value, (3 + 1) * 4)
 
+    def test_fifo_within_priority(self):
+        queue = ActionPriorityQueue(self.Priorities)
+        order: list[int] = []
+
+        for i in range(20):
+            queue.enqueue(self.Priorities.SECOND, lambda i=i: order.append(i))
+        queue.enqueue(self.Priorities.FIRST, lambda: order.append(-1))
+        self.assertEqual(len(queue), 21)
+
+        queue.perform()
+        self.assertEqual(order, [-1] + list(range(20)))
+        self.assertEqual(len(queue), 0)
+
+    def test_enqueue_during_perform(self):
+        queue = ActionPriorityQueue()
+        order: list[str] = []
+
+        def first():
+            order.append("first")
+            queue.enqueue(self.Priorities.SECOND, lambda: order.append("second"))
+
+        queue.enqueue(self.Priorities.THIRD, lambda: order.append("third"))
+        queue.enqueue(self.Priorities.FIRST, first)
+        queue.perform()
+        self.assertEqual(order, ["first", "second", "third"])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from utils.class_cache import ClassTableCache
+
+
+class TestClassTableCache(unittest.TestCase):
+
+    class Base:
+        size: int = 2
+
+    class Child(Base):
+        size = 3
+
+    def test_cache(self):
+        calls: list[type] = []
+
+        def factory(cls):
+            calls.append(cls)
+            return tuple(range(cls.size))
+
+        cache = ClassTableCache(factory, "size")
+
+        self.assertEqual(cache.get(self.Base), (0, 1))
+        self.assertEqual(cache.get(self.Child), (0, 1, 2))
+        self.assertEqual(cache.get(self.Base), (0, 1))
+        self.assertEqual(calls, [self.Base, self.Child])
+
+        # Invalidated by attribute change
+        self.Child.size = 1
+        try:
+            self.assertEqual(cache.get(self.Child), (0,))
+            self.assertEqual(calls, [self.Base, self.Child, self.Child])
+        finally:
+            self.Child.size = 3
+
+        cache.clear()
+        self.assertEqual(cache.get(self.Base), (0, 1))
+        self.assertEqual(len(calls), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from utils.action_queue import ActionPriority
+from utils.profiler import StepProfile
+
+
+class TestStepProfile(unittest.TestCase):
+
+    class Priorities(ActionPriority):
+        FIRST = 1
+        SECOND = 2
+
+    class Performer:
+        pass
+
+    def test_report(self):
+        profile = StepProfile()
+        profile.record_phase("gather", 0.5, 10)
+        profile.record_action(self.Priorities.FIRST, self.Performer, 0.25)
+
+        report = profile.report()
+        self.assertIn("gather", report)
+        self.assertIn("FIRST", report)
+        self.assertIn("Performer", report)
+
+    def test_report_columns(self):
+        profile = StepProfile()
+        profile.record_phase("step", 0.5, 10)
+        profile.record_phase("step", 0.5, 10)
+        profile.record_action(self.Priorities.FIRST, self.Performer, 0.25)
+
+        phase, priority, owner = profile.report().split("\n\n")
+
+        # Phases count calls, priorities and classes do not
+        self.assertEqual(phase.splitlines()[0].split()[:3], ["phase", "calls", "actions"])
+        self.assertEqual(phase.splitlines()[1].split()[:3], ["step", "2", "20"])
+        self.assertEqual(priority.splitlines()[0].split()[:2], ["priority", "actions"])
+        self.assertEqual(priority.splitlines()[1].split()[:3], ["FIRST", "1", "250.00"])
+        self.assertEqual(owner.splitlines()[0].split()[:2], ["class", "actions"])
+        self.assertEqual(owner.splitlines()[1].split()[:3], ["Performer", "1", "250.00"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import random
+import unittest
+from utils.rand_ext import chance, pack_random_state, unpack_random_state, random_state_struct
+
+
+class TestRandExt(unittest.TestCase):
+
+    def test_chance(self):
+        rng = random.Random(3)
+        self.assertTrue(all(chance(1.0, rng) for _ in range(100)))
+        self.assertFalse(any(chance(0.0, rng) for _ in range(100)))
+
+    def test_state_packing(self):
+        rng = random.Random(42)
+        rng.random()
+        rng.gauss(0, 1)  # Leaves a gauss value in state
+
+        for _ in range(2):
+            packed = pack_random_state(rng.getstate())
+            self.assertEqual(len(packed), random_state_struct.size)
+
+            restored = random.Random()
+            restored.setstate(unpack_random_state(b"xx" + packed, 2))
+            self.assertEqual(restored.getstate(), rng.getstate())
+            self.assertEqual([restored.random() for _ in range(5)], [rng.random() for _ in range(5)])
+
+            rng.gauss(0, 1)  # Consumes the gauss value
+
+
+if __name__ == '__main__':
+    unittest.main()
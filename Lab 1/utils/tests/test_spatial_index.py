@@ -0,0 +1,51 @@
+import unittest
+from utils.spatial_index import SpatialIndex
+
+
+class TestSpatialIndex(unittest.TestCase):
+
+    def test_add_remove(self):
+        index = SpatialIndex(bucket_size=4)
+
+        index.add("a", 1, 1)
+        index.add("a", 1, 1)
+        index.add("a", 9, 2)
+        index.add("b", 3, 3)
+        self.assertEqual(index.count("a"), 2)
+        self.assertEqual(index.count("b"), 1)
+        self.assertEqual(index.count("c"), 0)
+
+        index.remove("a", 1, 1)
+        index.remove("a", 1, 1)
+        index.remove("c", 0, 0)
+        self.assertEqual(index.count("a"), 1)
+        self.assertEqual(index.positions("a"), [(9, 2)])
+        self.assertEqual(set(index.keys()), {"a", "b"})
+
+        index.clear()
+        self.assertEqual(index.count("b"), 0)
+
+    def test_in_square(self):
+        index = SpatialIndex(bucket_size=3)
+        for pos in [(0, 0), (5, 5), (4, 6), (4, 4), (9, 9), (6, 5)]:
+            index.add("a", *pos)
+        index.add("b", 5, 4)
+
+        self.assertEqual(index.in_square(["a"], 5, 5, 1), [(4, 4), (4, 6), (5, 5), (6, 5)])
+        self.assertEqual(index.in_square(["a", "b"], 5, 5, 1), [(4, 4), (4, 6), (5, 4), (5, 5), (6, 5)])
+        self.assertEqual(index.in_square(["b"], 0, 0, 2), [])
+        self.assertEqual(index.in_square(["a"], -1, -1, 1), [(0, 0)])
+
+    def test_nearest(self):
+        index = SpatialIndex(bucket_size=2)
+        for pos in [(5, 5), (7, 5), (5, 3), (2, 2)]:
+            index.add("a", *pos)
+
+        self.assertEqual(index.nearest(["a"], 5, 5, 3), (5, 3))
+        self.assertEqual(index.nearest(["a"], 6, 5, 3), (5, 5))
+        self.assertEqual(index.nearest(["a"], 2, 8, 2), None)
+        self.assertEqual(index.nearest(["b"], 5, 5, 10), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from utils.action_queue import ActionPriority, ActionPriorityQueue
+from utils.step_phases import StepPhases, step_action, collect_step_actions
+from utils.profiler import StepProfile
+
+
+class TestStepPhases(unittest.TestCase):
+
+    class Priorities(ActionPriority):
+        FIRST = 1
+        SECOND = 2
+        THIRD = 3
+
+    class Base:
+
+        def __init__(self, name: str, log: list):
+            self.name = name
+            self.log = log
+
+        @step_action(2)
+        def second(self):
+            self.log.append((self.name, "base second"))
+
+        @step_action(1)
+        def __first(self):
+            self.log.append((self.name, "base first"))
+
+    class Child(Base):
+
+        @step_action(1)
+        def first(self):
+            self.log.append((self.name, "child first"))
+
+        @step_action(2)
+        def second(self):
+            self.log.append((self.name, "child second"))
+
+    def test_collect(self):
+        actions = collect_step_actions(self.Child)
+        self.assertEqual([priority for priority, _ in actions], [2, 1, 1])
+        self.assertIs(actions[0][1], self.Child.second)
+
+    def test_collect_override_priority(self):
+
+        class Late(self.Child):
+
+            @step_action(3)
+            def second(self):
+                pass
+
+        actions = collect_step_actions(Late)
+        self.assertEqual([priority for priority, _ in actions], [3, 1, 1])
+        self.assertIs(actions[0][1], Late.second)
+
+    def test_perform(self):
+        phases = StepPhases(self.Priorities)
+        log = []
+        performers = [self.Child("a", log), self.Base("b", log)]
+        phases.perform(performers)
+
+        self.assertEqual(log, [
+            ("a", "base first"), ("a", "child first"), ("b", "base first"),
+            ("a", "child second"), ("b", "base second")
+        ])
+        self.assertEqual(phases.count_actions(performers), 5)
+
+    def test_same_as_queue(self):
+        phases = StepPhases(self.Priorities)
+        phases_log, queue_log = [], []
+        phases.perform([self.Child("a", phases_log), self.Base("b", phases_log)])
+
+        queue = ActionPriorityQueue(self.Priorities)
+        for performer in (self.Child("a", queue_log), self.Base("b", queue_log)):
+            for priority, action in collect_step_actions(type(performer)):
+                queue.enqueue(priority, action.__get__(performer))
+        queue.perform()
+
+        self.assertEqual(phases_log, queue_log)
+
+    def test_perform_profiled(self):
+        phases = StepPhases(self.Priorities)
+        profile = StepProfile()
+        phases.perform_profiled([self.Child("a", []), self.Child("b", [])], profile)
+
+        self.assertEqual(profile.priorities[self.Priorities.FIRST].actions, 4)
+        self.assertEqual(profile.owners[self.Child].actions, 6)
+        self.assertNotIn(self.Priorities.THIRD, profile.priorities)
+
+    def test_unknown_priority(self):
+
+        class Stray:
+            @step_action(7)
+            def act(self):
+                pass
+
+        with self.assertRaises(ValueError):
+            StepPhases(self.Priorities).table(Stray)
+
+
+if __name__ == '__main__':
+    unittest.main()
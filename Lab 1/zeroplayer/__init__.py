@@ -5,7 +5,10 @@ __all__ = [
     "location",
     "display",
     "step_priorities",
-    "snapshotable"
+    "snapshotable",
+    "field_storage",
+    "field_columns",
+    "metrics"
 ]
 
 from . import *
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 
 class Fox(EntityCreature):
 
+    __slots__ = ()
+
     _max_lifetime: int = 30
 
     _residue_type = None
@@ -38,6 +40,8 @@ class Fox(EntityCreature):
 
 class Owl(EntityCreature):
 
+    __slots__ = ()
+
     _max_lifetime: int = 30
 
     _residue_type = None
@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 
 class DeadRabbit(EntityDecaying):
 
+    __slots__ = ()
+
     _integrity_cap: float = 1.0
     _integrity_start: float = 1.0
     _decay_speed: float = 0.2
@@ -20,6 +22,8 @@ class DeadRabbit(EntityDecaying):
 
 class DeadMouse(EntityDecaying):
 
+    __slots__ = ()
+
     _integrity_cap: float = 1.0
     _integrity_start: float = 1.0
     _decay_speed: float = 0.25
@@ -27,6 +31,8 @@ class DeadMouse(EntityDecaying):
 
 class Rabbit(EntityCreature):
 
+    __slots__ = ()
+
     _max_lifetime: int = 30
 
     _residue_type = DeadRabbit
@@ -43,6 +49,8 @@ class Rabbit(EntityCreature):
 
 class Mouse(EntityCreature):
 
+    __slots__ = ()
+
     _max_lifetime: int = 15
 
     _residue_type = DeadMouse
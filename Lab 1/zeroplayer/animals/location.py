@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from zeroplayer.location import Location, SpawnRule
 from zeroplayer.animals import plants
 from zeroplayer.animals import herbivores
@@ -19,9 +21,22 @@ class WoodlandEdge(Location):
     _height = 10
     _initial_rolls = 10
 
-    def __init__(self, create_empty: bool = False):
+    def __init__(
+            self,
+            create_empty: bool = False,
+            seed: int | None = None,
+            sparse: bool = False,
+            width: int | None = None,
+            height: int | None = None
+    ):
         super().__init__(
-            self._width,
-            self._initial_rolls,
-            self._spawn_rules, 0 if create_empty else self._initial_rolls
+            self._width if width is None else width,
+            self._height if height is None else height,
+            self._spawn_rules, 0 if create_empty else self._initial_rolls,
+            seed,
+            sparse
         )
+
+    @classmethod
+    def create_empty(cls, width: int, height: int, sparse: bool = False) -> WoodlandEdge:
+        return cls(create_empty=True, sparse=sparse, width=width, height=height)
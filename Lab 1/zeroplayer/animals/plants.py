@@ -3,6 +3,8 @@ from zeroplayer.entities.entity_decaying import EntityDecaying
 
 class Grass(EntityDecaying):
 
+    __slots__ = ()
+
     _integrity_cap: float = 1.0
     _integrity_start: float = 1.0
     _decay_speed: float = 0.05
@@ -10,6 +12,8 @@ class Grass(EntityDecaying):
 
 class Wheat(EntityDecaying):
 
+    __slots__ = ()
+
     _integrity_cap: float = 1.0
     _integrity_start: float = 0.8
     _decay_speed: float = 0.1
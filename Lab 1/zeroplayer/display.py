@@ -1,11 +1,14 @@
-from typing import Callable, Any
+from typing import Final
 from dataclasses import dataclass
 from enum import IntEnum
+from bisect import bisect_right
+import sys
 
-from utils.string_utils import str_proxy
+from utils.exceptions import InvalidInputError
 
 from zeroplayer.location import Location
-from zeroplayer.entities.entity_decaying import EntityDecaying
+from zeroplayer.entities.entity import Entity
+from zeroplayer.field_columns import FieldColumns
 from zeroplayer.animals import plants, herbivores, carnivores
 
 
@@ -37,7 +40,7 @@ def colored(text: str, color_index: int | Colors) -> str:
 #endregion
 
 
-#region //// Colored proxy overrides
+#region //// Color rules
 
 @dataclass
 class ColorRule:
@@ -67,61 +70,230 @@ carnivores_color_rules: list[ColorRule] = [
     ColorRule(0.00, Colors.DK_GRAY)
 ]
 
+#endregion
 
-def decaying_to_string(symbol: str, entity: EntityDecaying, color_rules: list[ColorRule]) -> str:
-    picked_rule: ColorRule = ColorRule()
-    for rule in color_rules:
-        if entity.integrity >= rule.range_bottom:
-            picked_rule = rule
-            break
-
-    return colored(symbol, picked_rule.color)
 
+#region //// Glyph tables
 
-overrides_colored: dict[type, Callable[[Any], str]] = {
-    # None
-    type(None): lambda obj: colored("·", Colors.DK_GRAY),
-    plants.Grass: lambda obj: decaying_to_string("g", obj, resource_color_rules),
-    plants.Wheat: lambda obj: decaying_to_string("w", obj, resource_color_rules),
-    herbivores.DeadMouse: lambda obj: decaying_to_string("m", obj, resource_color_rules),
-    herbivores.DeadRabbit: lambda obj: decaying_to_string("r", obj, resource_color_rules),
-    herbivores.Mouse: lambda obj: decaying_to_string("M", obj, herbivores_color_rules),
-    herbivores.Rabbit: lambda obj: decaying_to_string("R", obj, herbivores_color_rules),
-    carnivores.Fox: lambda obj: decaying_to_string("F", obj, carnivores_color_rules),
-    carnivores.Owl: lambda obj: decaying_to_string("O", obj, carnivores_color_rules)
+@dataclass
+class Glyph:
+    symbol: str
+    color_rules: list[ColorRule]  # Picked by integrity. No rules - default color
+
+
+glyphs: dict[type, Glyph] = {
+    plants.Grass: Glyph("g", resource_color_rules),
+    plants.Wheat: Glyph("w", resource_color_rules),
+    herbivores.DeadMouse: Glyph("m", resource_color_rules),
+    herbivores.DeadRabbit: Glyph("r", resource_color_rules),
+    herbivores.Mouse: Glyph("M", herbivores_color_rules),
+    herbivores.Rabbit: Glyph("R", herbivores_color_rules),
+    carnivores.Fox: Glyph("F", carnivores_color_rules),
+    carnivores.Owl: Glyph("O", carnivores_color_rules)
 }
 
-#endregion
+empty_glyph: Final[Glyph] = Glyph("·", [ColorRule(color=Colors.DK_GRAY)])
 
 
-#region //// Uncolored proxy overrides
+class GlyphLookup:
+    """
+    Glyph table compiled for rendering.
+    Per type stores the symbol and integrity buckets (ascending bottoms) with their colors.
+    """
 
-overrides_uncolored: dict[type, Callable[[Any], str]] = {
-    # None
-    type(None): lambda obj: "·",
-    plants.Grass: lambda obj: "g",
-    plants.Wheat: lambda obj: "w",
-    herbivores.DeadMouse: lambda obj: "m",
-    herbivores.DeadRabbit: lambda obj: "r",
-    herbivores.Mouse: lambda obj: "M",
-    herbivores.Rabbit: lambda obj: "R",
-    carnivores.Fox: lambda obj: "F",
-    carnivores.Owl: lambda obj: "O"
-}
+    table: dict[type, tuple[str, list[float], list[int]]]
+
+    def __init__(self, glyph_table: dict[type, Glyph]):
+        self.table = {entity_type: self.compile(glyph) for entity_type, glyph in glyph_table.items()}
+
+    @staticmethod
+    def compile(glyph: Glyph) -> tuple[str, list[float], list[int]]:
+        rules = sorted(glyph.color_rules, key=lambda rule: rule.range_bottom)
+        bottoms = [float("-inf")] + [rule.range_bottom for rule in rules]
+        colors = [int(Colors.DEFAULT)] + [int(rule.color) for rule in rules]
+        return glyph.symbol, bottoms, colors
+
+
+glyph_lookup: Final[GlyphLookup] = GlyphLookup(glyphs)
+
+empty_cell: Final[tuple[str, int]] = (empty_glyph.symbol, int(empty_glyph.color_rules[0].color))
+
+
+def entity_cell(entity: Entity | None) -> tuple[str, int]:
+    """Returns symbol and color of a cell holding the entity (or nothing)"""
+    if entity is None: return empty_cell
+
+    entry = glyph_lookup.table.get(type(entity))
+    if entry is None: return str(entity), int(Colors.DEFAULT)
+
+    # Types without color rules may have no integrity
+    symbol, bottoms, colors = entry
+    return symbol, colors[bisect_right(bottoms, entity.integrity) - 1] if len(bottoms) > 1 else colors[0]
 
 #endregion
 
 
 #region //// Print Location
 
+color_escapes: Final[dict[int, str]] = {int(color): f"\x1b[{int(color)}m" for color in Colors}
+
+# Larger locations are not rendered (text of the whole field would not fit anywhere)
+render_max_cells: Final[int] = 4_000_000
+
+
+def check_renderable(location: Location) -> None:
+    """Raises InvalidInputError if the location is too large to render"""
+    if location.width * location.height > render_max_cells:
+        raise InvalidInputError(
+            f"location of {location.width}x{location.height} is too large to print "
+            f"(at most {render_max_cells} cells)"
+        )
+
+
+def render_location(location: Location, render_colored: bool) -> str:
+    """
+    Returns current location state with all entities as text, a line per row.
+    Colored text has one escape sequence per run of cells of the same color.
+    Reads only occupied cells, runs of empty cells are written at once.
+    """
+    check_renderable(location)
+    default_color = int(Colors.DEFAULT)
+    empty_symbol, empty_color = empty_cell
+    width = location.width
+
+    out: list[str] = []
+    cells = location.occupied()
+    cell = next(cells, None)
+
+    for y in range(location.height):
+        current_color = default_color
+        x = 0  # First cell of the row not written yet
+
+        while x < width:
+
+            # Pick symbol, color and length of a run (empty cells up to the next entity of the row)
+            if cell is not None and cell[1] == y and cell[0] == x:
+                (symbol, color), length = entity_cell(cell[2]), 1
+                cell = next(cells, None)
+            else:
+                end = cell[0] if cell is not None and cell[1] == y else width
+                symbol, color, length = empty_symbol, empty_color, end - x
+
+            # Write
+            if render_colored and color != current_color:
+                out.append(color_escapes.get(color) or f"\x1b[{color}m")
+                current_color = color
+            out.append(symbol * length)
+            x += length
+
+        if current_color != default_color:
+            out.append(color_escapes[default_color])
+        out.append("\n")
+
+    return "".join(out)
+
+
+def render_columns(columns: FieldColumns, render_colored: bool) -> str:
+    """
+    Same as render_location, reading types and integrities from field columns,
+    so entities are never created (e.g. for a mapped field file).
+    Types without a glyph are shown as '?'.
+    """
+    default_color = int(Colors.DEFAULT)
+
+    # Entry per type code, code 0 is an empty cell
+    entries = [(empty_cell[0], [float("-inf")], [empty_cell[1]])]
+    entries += [glyph_lookup.table.get(entity_type, ("?", [float("-inf")], [default_color])) for entity_type in columns.type_table]
+
+    codes, integrity, width = columns.type_codes, columns.integrity, columns.width
+
+    out: list[str] = []
+    for start in range(0, width * columns.height, width):
+        current_color = default_color
+
+        for i in range(start, start + width):
+
+            # Pick symbol and color
+            symbol, bottoms, colors = entries[codes[i]]
+            color = colors[bisect_right(bottoms, integrity[i]) - 1] if len(bottoms) > 1 else colors[0]
+
+            # Write
+            if render_colored and color != current_color:
+                out.append(color_escapes.get(color) or f"\x1b[{color}m")
+                current_color = color
+            out.append(symbol)
+
+        if current_color != default_color:
+            out.append(color_escapes[default_color])
+        out.append("\n")
+
+    return "".join(out)
+
+
 def print_location(location: Location, print_colored: bool):
     """Prints current location state with all entities"""
+    sys.stdout.write(render_location(location, print_colored))
+    sys.stdout.flush()
+
+#endregion
+
+
+#region //// Live view
+
+cursor_hide: Final[str] = "\x1b[?25l"
+cursor_show: Final[str] = "\x1b[?25h"
+screen_clear: Final[str] = "\x1b[2J\x1b[H"
+
+
+def cursor_to(row: int, column: int) -> str:
+    """Returns escape moving cursor to a 0-based position"""
+    return f"\x1b[{row + 1};{column + 1}H"
+
+
+def location_cells(location: Location) -> list[tuple[str, int]]:
+    """Returns (symbol, color) of every cell of the location in reading order"""
+    check_renderable(location)
+    width = location.width
+    cells = [empty_cell] * (width * location.height)
+    for x, y, entity in location.occupied():
+        cells[y * width + x] = entity_cell(entity)
+    return cells
+
+
+def render_cells_diff(
+        previous: list[tuple[str, int]] | None,
+        current: list[tuple[str, int]],
+        width: int,
+        render_colored: bool
+) -> str:
+    """
+    Returns text that redraws cells that differ from previous frame,
+    using cursor addressing (field is drawn from the top left corner of the screen).
+    Redraws every cell if there is no previous frame.
+    """
+    default_color = int(Colors.DEFAULT)
+    current_color = default_color
+    cursor = -1  # Cell index the cursor is at
+
+    out: list[str] = []
+    for i, cell in enumerate(current):
+        if previous is not None and previous[i] == cell: continue
+        symbol, color = cell
+
+        # Move (unless already there after previous cell in the row)
+        if cursor != i or i % width == 0:
+            out.append(cursor_to(i // width, i % width))
+
+        if render_colored and color != current_color:
+            out.append(color_escapes.get(color) or f"\x1b[{color}m")
+            current_color = color
+
+        out.append(symbol)
+        cursor = i + 1
 
-    proxy_overrides = overrides_colored if print_colored else overrides_uncolored
+    if current_color != default_color:
+        out.append(color_escapes[default_color])
 
-    for row in location.rows:
-        for entity in row:
-            print(str_proxy(entity, proxy_overrides), end="")
-        print("\n", end="")
+    return "".join(out)
 
 #endregion
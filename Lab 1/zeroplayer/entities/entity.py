@@ -1,4 +1,5 @@
 from utils.action_queue import ActionPriorityQueue
+from utils.step_phases import step_action, collect_step_actions
 from abc import ABCMeta
 
 from zeroplayer.location import Location
@@ -8,7 +9,13 @@ from zeroplayer.snapshotable import Snapshotable, Snapshot
 
 
 class Entity(Snapshotable, metaclass=ABCMeta):
-    """Base class for all entities."""
+    """
+    Base class for all entities.
+    Entities are slotted: subclasses declare __slots__ (empty if they add no fields).
+    Subclasses of EntityMoving also declare fields of that branch, see EntityMoving.
+    """
+
+    __slots__ = ("__lifetime", "__location", "__x", "__y")
 
     def __init__(self):
         self.__lifetime = 0
@@ -16,15 +23,18 @@ class Entity(Snapshotable, metaclass=ABCMeta):
 
     def step(self, action_queue: ActionPriorityQueue) -> None:
         """
-        Enqueues all actions from this entity
-        Should be extended by children via super.
+        Enqueues all step actions of this entity.
+        Actions are declared with step_action, not by extending this method.
+        Location does not call this, it performs actions of all entities phase by phase (see StepPhases).
         """
-        action_queue.enqueue(StepPriority.LIFETIME, self.__action_increase_lifetime)
+        for priority, action in collect_step_actions(type(self)):
+            action_queue.enqueue(priority, action.__get__(self))
 
     #region //// Lifetime
 
     __lifetime: int
 
+    @step_action(StepPriority.LIFETIME)
     def __action_increase_lifetime(self):
         self.__lifetime += 1
 
@@ -1,11 +1,11 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Generator, Type, cast
 
-from utils.action_queue import ActionPriorityQueue
+from utils.step_phases import step_action
 from utils.exceptions import InvalidOperationError
 import utils.activator as activator
+from utils.class_cache import ClassTableCache
 from utils.rand_ext import chance
-from random import choice
 from abc import ABCMeta
 
 from zeroplayer.step_priorities import StepPriority
@@ -18,6 +18,9 @@ if TYPE_CHECKING:
     from zeroplayer.snapshotable import Snapshot
 
 
+_spawn_shifts_cache = ClassTableCache(lambda cls: tuple(cls.get_allowed_spawn_shifts()))
+
+
 class EntityCreature(EntityHunter, EntityDecaying, metaclass=ABCMeta):
     """
     An EntityHunter with a max lifetime, procreation, and hunger as integrity
@@ -25,6 +28,13 @@ class EntityCreature(EntityHunter, EntityDecaying, metaclass=ABCMeta):
 
     #region //// Init
 
+    # EntityHunter and EntityDecaying both extend EntityKillable,
+    # and only one of them can add slots without an instance layout conflict.
+    # So the moving branch (EntityMoving, EntityHunter) has empty __slots__
+    # and its fields are declared here, by branch_slots.
+    # Other subclasses of that branch have to declare them as well.
+    __slots__ = EntityHunter.branch_slots + ("__procreation_current_cooldown",)
+
     _max_lifetime: int
 
     _satiety_multipliers: dict[Type[EntityKillable], float] = {}
@@ -39,17 +49,9 @@ class EntityCreature(EntityHunter, EntityDecaying, metaclass=ABCMeta):
 
     #endregion
 
-    #region //// Step
-
-    def step(self, action_queue: ActionPriorityQueue) -> None:
-        super().step(action_queue)
-        action_queue.enqueue(StepPriority.AGE, self.__action_age)
-        action_queue.enqueue(StepPriority.PROCREATION, self.__action_procreate)
-
-    #endregion
-
     #region //// Max lifetime
 
+    @step_action(StepPriority.AGE)
     def __action_age(self):
         if self.lifetime > self._max_lifetime:
             self.kill()
@@ -83,6 +85,7 @@ class EntityCreature(EntityHunter, EntityDecaying, metaclass=ABCMeta):
 
     #region //// Procreation
 
+    @step_action(StepPriority.PROCREATION)
     def __action_procreate(self):
 
         # Killed guard
@@ -98,26 +101,29 @@ class EntityCreature(EntityHunter, EntityDecaying, metaclass=ABCMeta):
             return
 
         # Spawn with chance
-        if chance(self._procreation_chance):
+        if chance(self._procreation_chance, self.location.random):
 
             # Get valid spawn position
-            spawn_positions = list(
-                                filter(
-                                    lambda pos: self.location.position_empty(*pos),
-                                    self.get_allowed_spawn_destinations()
-                                )
-                            )
+            spawn_positions = self.location.free_positions(self.get_allowed_spawn_destinations())
 
             # Spawn at random valid position
             if len(spawn_positions) > 0:
-                spawn_x, spawn_y = choice(spawn_positions)
+                spawn_x, spawn_y = self.location.random.choice(spawn_positions)
                 child = cast(type(self), activator.create_instance(type(self), ()))  # Create
                 child.place_at(self.location, spawn_x, spawn_y)  # Move
                 child.integrity = self.satiety  # Set satiety
 
+                if self.location.metrics is not None:
+                    self.location.metrics.record_birth(type(self))
+
         # Reset cooldown
         self.__procreation_current_cooldown = self._procreation_cooldown
 
+    @property
+    def procreation_cooldown(self) -> int:
+        """Steps left until procreation can be attempted"""
+        return self.__procreation_current_cooldown
+
     @staticmethod
     def get_allowed_spawn_shifts() -> Generator[tuple[int, int], None, None]:
         """
@@ -133,8 +139,13 @@ class EntityCreature(EntityHunter, EntityDecaying, metaclass=ABCMeta):
         yield 0, -1
         yield 0, 1
 
+    @classmethod
+    def get_allowed_spawn_shift_table(cls) -> tuple[tuple[int, int], ...]:
+        """Returns get_allowed_spawn_shifts() as a tuple. Cached per class."""
+        return _spawn_shifts_cache.get(cls)
+
     def get_allowed_spawn_destinations(self) -> Generator[tuple[int, int], None, None]:
-        for dx, dy in self.get_allowed_spawn_shifts():
+        for dx, dy in self.get_allowed_spawn_shift_table():
             yield self.location.clamp_position(self.x + dx, self.y + dy)
 
     #endregion
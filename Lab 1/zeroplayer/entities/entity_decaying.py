@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from utils.action_queue import ActionPriorityQueue
+from utils.step_phases import step_action
 from utils.math import clamp
 from abc import ABCMeta
 
@@ -18,6 +18,8 @@ class EntityDecaying(EntityKillable, metaclass=ABCMeta):
 
     #region //// Init
 
+    __slots__ = ("__integrity",)
+
     __integrity: float
     _integrity_cap: float = 1.0
     _integrity_start: float = 1.0
@@ -29,16 +31,9 @@ class EntityDecaying(EntityKillable, metaclass=ABCMeta):
 
     #endregion
 
-    #region //// Step
-
-    def step(self, action_queue: ActionPriorityQueue) -> None:
-        super().step(action_queue)
-        action_queue.enqueue(StepPriority.DECAY, self.__action_decay)
-
-    #endregion
-
     #region //// Decay, Integrity
 
+    @step_action(StepPriority.DECAY)
     def __action_decay(self):
         self.__integrity -= self._decay_speed
         if self.__integrity <= 0:
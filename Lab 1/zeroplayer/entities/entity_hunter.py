@@ -1,25 +1,38 @@
 from __future__ import annotations
 from typing import Generator, cast
 
-from utils.action_queue import ActionPriorityQueue
+from utils.step_phases import step_action
 from utils.exceptions import InvalidOperationError
+from utils.class_cache import ClassTableCache
 from abc import ABCMeta, abstractmethod
-from random import randint
 
 from zeroplayer.step_priorities import StepPriority
 from zeroplayer.entities.entity_killable import EntityKillable
 from zeroplayer.entities.entity_moving import EntityMoving
 
 
+_vision_shift_set_cache = ClassTableCache(lambda cls: frozenset(cls.get_vision_shifts()), "_vision_distance")
+
+
 class EntityHunter(EntityMoving, metaclass=ABCMeta):
     """
     An Entity that wanders and searches for other entities
     and leaps towards targets, killing them.
-    Can only kill EntityKillable
+    Can only kill EntityKillable.
+    Concrete subclasses must include branch_slots in their __slots__ (see EntityMoving).
     """
 
     #region //// Init
 
+    __slots__ = ()
+
+    # Fields of this class and EntityMoving, to be declared as slots by subclasses
+    branch_slots: tuple[str, ...] = EntityMoving.branch_slots + (
+        "_EntityHunter__has_leaped",
+        "_EntityHunter__leap_x",
+        "_EntityHunter__leap_y"
+    )
+
     _vision_distance: int = 4  # For default vision
 
     _prey_types: tuple[EntityKillable, ...] = ()
@@ -36,34 +49,26 @@ class EntityHunter(EntityMoving, metaclass=ABCMeta):
 
     #endregion
 
-    #region //// Step
-
-    def step(self, action_queue: ActionPriorityQueue) -> None:
-        super().step(action_queue)
-        action_queue.enqueue(StepPriority.LEAP_ATTACK, self.__action_leap_attack)
-        action_queue.enqueue(StepPriority.SEARCH, self.__action_search)
-        action_queue.enqueue(StepPriority.WANDER, self.__action_wander)
-        action_queue.enqueue(StepPriority.LEAP_MOVE, self.__action_leap_move)
-
-    #endregion
-
     #region //// Searching, wandering
 
+    @step_action(StepPriority.SEARCH)
     def __action_search(self):
         if self.location is None:
             raise InvalidOperationError("Cannot search when not on location")
 
-        # Look around
-        for dest_x, dest_y in self.get_vision_destinations():
-            # If prey is seen
-            if type(self.location.entity_at_position(dest_x, dest_y)) in self._prey_types:
-                # Switch attention to it if it is closer
-                has_changed_target = self.set_move_target_if_closer(dest_x, dest_y)
-                if has_changed_target: continue
-                # Switch attention to it if currently chasing None
-                if self.entity_at_move_target() is None:
-                    self.set_move_target(dest_x, dest_y)
+        # Look around (prey is looked up via location index, in the order vision shifts would visit it)
+        vision_shifts = self.get_vision_shift_set()
+        for dest_x, dest_y in self.location.positions_of_types(self._prey_types, self.x, self.y, self._vision_distance):
+            if (dest_x - self.x, dest_y - self.y) not in vision_shifts: continue
+
+            # Switch attention to prey if it is closer
+            has_changed_target = self.set_move_target_if_closer(dest_x, dest_y)
+            if has_changed_target: continue
+            # Switch attention to prey if currently chasing None
+            if self.entity_at_move_target() is None:
+                self.set_move_target(dest_x, dest_y)
 
+    @step_action(StepPriority.WANDER)
     def __action_wander(self):
         if self.location is None:
             raise InvalidOperationError("Cannot search when not on location")
@@ -76,8 +81,8 @@ class EntityHunter(EntityMoving, metaclass=ABCMeta):
 
         # Move to random location
         self.set_move_target(
-            randint(0, self.location.width - 1),
-            randint(0, self.location.height - 1)
+            self.location.random.randint(0, self.location.width - 1),
+            self.location.random.randint(0, self.location.height - 1)
         )
 
     #endregion
@@ -89,20 +94,26 @@ class EntityHunter(EntityMoving, metaclass=ABCMeta):
         """
         Virtual.
         Returns relative displacements (dx, dy) this entity can see.
+        Must stay within the square of _vision_distance.
         """
         for xx in range(-cls._vision_distance, cls._vision_distance+1):
             for yy in range(-cls._vision_distance, cls._vision_distance+1):
                 if xx != 0 or yy != 0:
                     yield xx, yy
 
-    def get_vision_destinations(self) -> Generator[tuple[int, int], None, None]:
-        for dx, dy in self.get_vision_shifts():
-            yield self.location.clamp_position(self.x + dx, self.y + dy)
+    @classmethod
+    def get_vision_shift_set(cls) -> frozenset[tuple[int, int]]:
+        """
+        Returns get_vision_shifts() as a set.
+        Cached per class, recomputed when _vision_distance changes.
+        """
+        return _vision_shift_set_cache.get(cls)
 
     #endregion
 
     #region //// Leap
 
+    @step_action(StepPriority.LEAP_ATTACK)
     def __action_leap_attack(self):
         # Reset leap
         self.__has_leaped = False
@@ -111,7 +122,7 @@ class EntityHunter(EntityMoving, metaclass=ABCMeta):
         if not self.has_move_target(): return
 
         # Check distance
-        if self.distance_to_target() > self._leap_distance: return  # Target must be within leap range
+        if self.distance_squared_to_target() > self._leap_distance ** 2: return  # Target must be within leap range
 
         # Check target
         prey = self.entity_at_move_target()
@@ -121,11 +132,14 @@ class EntityHunter(EntityMoving, metaclass=ABCMeta):
 
         # Perform leap attack
         cast(EntityKillable, prey).kill(no_residue=True)
+        if self.location.metrics is not None:
+            self.location.metrics.record_kill(type(prey))
         self.__has_leaped = True
         self.__leap_x, self.__leap_y = self.get_move_target_position()
         self.remove_move_target()
         self.leap_process_prey(prey)
 
+    @step_action(StepPriority.LEAP_MOVE)
     def __action_leap_move(self):
         if not self.__has_leaped: return
         if self.is_killed: return
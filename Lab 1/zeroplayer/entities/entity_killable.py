@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import Type, Any, cast
 
-from utils.action_queue import ActionPriorityQueue
+from utils.step_phases import step_action
 import utils.activator as activator
 from abc import ABCMeta
 
@@ -14,6 +14,8 @@ class EntityKillable(Entity, metaclass=ABCMeta):
 
     #region //// Init
 
+    __slots__ = ("__killed", "__no_residue")
+
     __killed: bool
     __no_residue: bool
     _residue_type: Type[Entity] | None = None
@@ -28,10 +30,7 @@ class EntityKillable(Entity, metaclass=ABCMeta):
 
     #region //// Step
 
-    def step(self, action_queue: ActionPriorityQueue) -> None:
-        super().step(action_queue)
-        action_queue.enqueue(StepPriority.KILL, self.__action_kill)
-
+    @step_action(StepPriority.KILL)
     def __action_kill(self):
         if not self.__killed: return
         self.kill_instant()
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Generator
 
-from utils.action_queue import ActionPriorityQueue
+from utils.step_phases import step_action
 from utils.exceptions import InvalidOperationError
+from utils.class_cache import ClassTableCache
 from abc import ABCMeta
 from dataclasses import dataclass
 import math
@@ -16,11 +17,42 @@ if TYPE_CHECKING:
     from zeroplayer.snapshotable import Snapshot
 
 
+_allowed_shifts_cache = ClassTableCache(lambda cls: tuple(cls.get_allowed_shifts()), "_shift_distance")
+
+
 class EntityMoving(EntityKillable, metaclass=ABCMeta):
-    """An Entity that can move over time"""
+    """
+    An Entity that can move over time.
+    Unlike other entities, has empty __slots__: its fields can not be slots here (see EntityCreature).
+    Concrete subclasses must include branch_slots in their __slots__, this is checked when they are defined.
+    """
 
     #region //// Init
 
+    __slots__ = ()
+
+    # Fields of this class, to be declared as slots by subclasses.
+    # Branch subclasses with fields of their own extend it.
+    branch_slots: tuple[str, ...] = ("_EntityMoving__target",)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Branch classes leave the slots to their subclasses, but have to keep the inherited ones
+        if "branch_slots" in vars(cls):
+            for base in cls.__bases__:
+                missing = [name for name in getattr(base, "branch_slots", ()) if name not in cls.branch_slots]
+                if missing:
+                    raise TypeError(f"{cls.__name__}.branch_slots lacks {', '.join(missing)} of {base.__name__}")
+            return
+
+        # Instances with __dict__ can hold any field
+        if cls.__dictoffset__ != 0: return
+
+        missing = [name for name in cls.branch_slots if not hasattr(cls, name)]
+        if missing:
+            raise TypeError(f"{cls.__name__} has to declare {', '.join(missing)} in __slots__ (see branch_slots)")
+
     __target: MovementTarget | None
 
     def __init__(self):
@@ -30,14 +62,6 @@ class EntityMoving(EntityKillable, metaclass=ABCMeta):
 
     #endregion
 
-    #region //// Step
-
-    def step(self, action_queue: ActionPriorityQueue) -> None:
-        super().step(action_queue)
-        action_queue.enqueue(StepPriority.MOVE, self.advance_to_target_instant)
-
-    #endregion
-
     #region //// Instant movement
 
     def move_to_instant(self, x: int, y: int) -> bool:
@@ -57,6 +81,7 @@ class EntityMoving(EntityKillable, metaclass=ABCMeta):
         self.place_at(self.location, x, y)
         return True
 
+    @step_action(StepPriority.MOVE)
     def advance_to_target_instant(self):
         if not self.has_move_target(): return
 
@@ -68,11 +93,15 @@ class EntityMoving(EntityKillable, metaclass=ABCMeta):
             self.remove_move_target()
             return
 
-        # Get and sort dest-s by distance to target
-        destinations = list(self.get_shift_destinations())
-        destinations.sort(key=lambda dest: self.__target.distance_from(*dest))
+        # Get unoccupied dest-s and sort by distance to target
+        x, y = self.x, self.y
+        clamp_position = self.location.clamp_position
+        destinations = self.location.free_positions(
+            [clamp_position(x + dx, y + dy) for dx, dy in self.get_allowed_shift_table()]
+        )
+        destinations.sort(key=lambda dest: self.__target.distance_squared_from(*dest))
 
-        # Goto first unoccupied
+        # Goto first
         for new_x, new_y in destinations:
             if self.move_to_instant(new_x, new_y): break
 
@@ -108,8 +137,8 @@ class EntityMoving(EntityKillable, metaclass=ABCMeta):
 
         # Pick closer of the 2
         x, y = self.location.clamp_position(x, y)
-        new_dist = MovementTarget.distance_2d(self.x, self.y, x, y)
-        if new_dist < self.distance_to_target():
+        new_dist = MovementTarget.distance_squared_2d(self.x, self.y, x, y)
+        if new_dist < self.distance_squared_to_target():
             self.set_move_target(x, y)
             return True
 
@@ -134,6 +163,10 @@ class EntityMoving(EntityKillable, metaclass=ABCMeta):
     def distance_to_target(self) -> float:
         return self.__target.distance_from(self.x, self.y)
 
+    def distance_squared_to_target(self) -> int:
+        """Same order as distance_to_target, without sqrt. Prefer for comparisons."""
+        return self.__target.distance_squared_from(self.x, self.y)
+
     #endregion
 
     #region //// Shifts
@@ -156,9 +189,13 @@ class EntityMoving(EntityKillable, metaclass=ABCMeta):
         yield 0, -1
         yield 0, 1
 
-    def get_shift_destinations(self) -> Generator[tuple[int, int], None, None]:
-        for dx, dy in self.get_allowed_shifts():
-            yield self.location.clamp_position(self.x + dx, self.y + dy)
+    @classmethod
+    def get_allowed_shift_table(cls) -> tuple[tuple[int, int], ...]:
+        """
+        Returns get_allowed_shifts() as a tuple.
+        Cached per class, recomputed when _shift_distance changes.
+        """
+        return _allowed_shifts_cache.get(cls)
 
     #endregion
 
@@ -188,6 +225,15 @@ class MovementTarget:
     def distance_from(self, start_x: int, start_y: int) -> float:
         return self.distance_2d(start_x, start_y, self.x, self.y)
 
+    def distance_squared_from(self, start_x: int, start_y: int) -> int:
+        return self.distance_squared_2d(start_x, start_y, self.x, self.y)
+
     @staticmethod
     def distance_2d(x1: float, y1: float, x2: float, y2: float) -> float:
         return math.hypot(x2 - x1, y2 - y1)
+
+    @staticmethod
+    def distance_squared_2d(x1: int, y1: int, x2: int, y2: int) -> int:
+        dx = x2 - x1
+        dy = y2 - y1
+        return dx * dx + dy * dy
@@ -0,0 +1,138 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Type, Final, Any
+from array import array
+
+from zeroplayer.entities.entity_decaying import EntityDecaying
+from zeroplayer.entities.entity_moving import EntityMoving
+from zeroplayer.entities.entity_creature import EntityCreature
+
+# annotations
+if TYPE_CHECKING:
+    from zeroplayer.location import Location
+    from zeroplayer.entities.entity import Entity
+
+
+class FieldColumns:
+    """
+    Structure-of-arrays copy of a Location field.
+    Every column has one value per cell in reading order (index = y * width + x).
+
+    Type code 0 is an empty cell, code i is type_table[i-1].
+    Cells without a value for a column hold a placeholder:
+    nan for integrity, -1 for cooldown and move target.
+
+    Columns are arrays, or memoryviews of the same typecodes (see from_columns).
+    """
+
+    # Column names and typecodes, in the order columns are stored
+    column_typecodes: Final[tuple[tuple[str, str], ...]] = (
+        ("type_codes", "B"),
+        ("integrity", "d"),
+        ("lifetime", "q"),
+        ("procreation_cd", "q"),
+        ("target_x", "q"),
+        ("target_y", "q")
+    )
+
+    width: int
+    height: int
+    type_table: list[Type[Entity]]
+
+    type_codes: array       # 'B'
+    integrity: array        # 'd'
+    lifetime: array         # 'q'
+    procreation_cd: array   # 'q'
+    target_x: array         # 'q'
+    target_y: array         # 'q'
+
+    def __init__(self, width: int, height: int, type_table: list[Type[Entity]] | None = None):
+        cells = width * height
+        self.width = width
+        self.height = height
+        self.type_table = [] if type_table is None else list(type_table)
+
+        self.type_codes = array("B", bytes(cells))
+        self.integrity = array("d", [float("nan")]) * cells
+        self.lifetime = array("q", [0]) * cells
+        self.procreation_cd = array("q", [-1]) * cells
+        self.target_x = array("q", [-1]) * cells
+        self.target_y = array("q", [-1]) * cells
+
+    #region //// Types
+
+    def type_code(self, entity_type: Type[Entity]) -> int:
+        """Returns code of a type, adding it to the type table if needed"""
+        try:
+            return self.type_table.index(entity_type) + 1
+        except ValueError:
+            if len(self.type_table) >= 255:
+                raise OverflowError("too many entity types for a type column")
+            self.type_table.append(entity_type)
+            return len(self.type_table)
+
+    def type_at(self, x: int, y: int) -> Type[Entity] | None:
+        code = self.type_codes[y * self.width + x]
+        return None if code == 0 else self.type_table[code - 1]
+
+    #endregion
+
+    #region //// Creation
+
+    @classmethod
+    def from_location(cls, location: Location, type_table: list[Type[Entity]] | None = None) -> FieldColumns:
+        """Copies the state of every entity on the field into columns"""
+        columns = cls(location.width, location.height, type_table)
+        codes: dict[type, int] = {}
+
+        for x, y, entity in location.occupied():
+            i = y * location.width + x
+
+            entity_type = type(entity)
+            code = codes.get(entity_type)
+            if code is None:
+                code = columns.type_code(entity_type)
+                codes[entity_type] = code
+
+            columns.type_codes[i] = code
+            columns.lifetime[i] = entity.lifetime
+
+            if isinstance(entity, EntityDecaying):
+                columns.integrity[i] = entity.integrity
+
+            if isinstance(entity, EntityCreature):
+                columns.procreation_cd[i] = entity.procreation_cooldown
+
+            if isinstance(entity, EntityMoving) and entity.has_move_target():
+                columns.target_x[i], columns.target_y[i] = entity.get_move_target_position()
+
+        return columns
+
+    @classmethod
+    def from_columns(cls, width: int, height: int, type_table: list[Type[Entity]], **columns: Any) -> FieldColumns:
+        """
+        Wraps existing columns without copying them,
+        e.g. memoryviews of a mapped file. Every column of column_typecodes must be given.
+        """
+        result = cls.__new__(cls)
+        result.width = width
+        result.height = height
+        result.type_table = list(type_table)
+
+        for name, _ in cls.column_typecodes:
+            column = columns[name]
+            if len(column) != width * height:
+                raise ValueError(f"column {name} has {len(column)} values, expected {width * height}")
+            setattr(result, name, column)
+        return result
+
+    #endregion
+
+    #region //// Aggregates
+
+    def population(self) -> dict[Type[Entity], int]:
+        """Returns amount of entities per type"""
+        raw = bytes(self.type_codes)
+        counts = {entity_type: raw.count(i + 1) for i, entity_type in enumerate(self.type_table)}
+        return {entity_type: count for entity_type, count in counts.items() if count > 0}
+
+    #endregion
@@ -0,0 +1,194 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterator, Iterable, Sequence, Final
+from abc import ABCMeta, abstractmethod
+from itertools import compress
+
+# annotations
+if TYPE_CHECKING:
+    from zeroplayer.entities.entity import Entity
+
+
+class FieldStorage(metaclass=ABCMeta):
+    """
+    Cells of a Location field.
+    Holds an entity or None per cell, does not validate positions.
+    """
+
+    # Sparse storages take memory per stored entity, not per cell
+    sparse: bool = False
+
+    width: int
+    height: int
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+    #region //// Cells
+
+    @abstractmethod
+    def get(self, x: int, y: int) -> Entity | None:
+        pass
+
+    @abstractmethod
+    def set(self, x: int, y: int, value: Entity | None) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Empties every cell"""
+        pass
+
+    def is_empty(self, x: int, y: int) -> bool:
+        return self.get(x, y) is None
+
+    def free_positions(self, positions: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+        """Returns positions of empty cells among given positions, keeping their order"""
+        return [pos for pos in positions if self.get(pos[0], pos[1]) is None]
+
+    #endregion
+
+    #region //// Iteration
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Entity | None]:
+        """Iterates over all cells in reading order"""
+        pass
+
+    @abstractmethod
+    def occupied(self) -> Iterator[tuple[int, int, Entity]]:
+        """Iterates over (x, y, entity) of non-empty cells in reading order"""
+        pass
+
+    def rows(self) -> list[Sequence[Entity | None]]:
+        """Returns cells as a list of rows. Rows are not guaranteed to be views of the storage."""
+        return [[self.get(x, y) for x in range(self.width)] for y in range(self.height)]
+
+    #endregion
+
+
+class FlatFieldStorage(FieldStorage):
+    """
+    Field stored as a single row-major list (index = y * width + x),
+    with an occupancy mask (a byte per cell, 1 - occupied) kept alongside.
+    Emptiness checks read the mask only.
+    """
+
+    __cells: list[Entity | None]
+    __occupancy: bytearray
+
+    def __init__(self, width: int, height: int):
+        super().__init__(width, height)
+        self.clear()
+
+    @property
+    def occupancy(self) -> memoryview:
+        """The occupancy mask, read only"""
+        return memoryview(self.__occupancy).toreadonly()
+
+    def get(self, x: int, y: int) -> Entity | None:
+        return self.__cells[y * self.width + x]
+
+    def set(self, x: int, y: int, value: Entity | None) -> None:
+        i = y * self.width + x
+        self.__cells[i] = value
+        self.__occupancy[i] = value is not None
+
+    def clear(self) -> None:
+        self.__cells = [None] * (self.width * self.height)
+        self.__occupancy = bytearray(self.width * self.height)
+
+    def is_empty(self, x: int, y: int) -> bool:
+        return not self.__occupancy[y * self.width + x]
+
+    def free_positions(self, positions: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+        occupancy, width = self.__occupancy, self.width
+        return [pos for pos in positions if not occupancy[pos[1] * width + pos[0]]]
+
+    def __iter__(self) -> Iterator[Entity | None]:
+        return iter(self.__cells)
+
+    def occupied(self) -> Iterator[tuple[int, int, Entity]]:
+        # Entities are always truthy, compress skips empty cells without leaving C
+        cells, width = self.__cells, self.width
+        for i in compress(range(len(cells)), cells):
+            yield i % width, i // width, cells[i]
+
+    def rows(self) -> list[Sequence[Entity | None]]:
+        cells, width = self.__cells, self.width
+        return [cells[start:start + width] for start in range(0, len(cells), width)]
+
+
+class ChunkedFieldStorage(FieldStorage):
+    """
+    Field stored as square chunks (keyed by chunk coordinates),
+    a chunk is allocated on first placement in it and freed when it becomes empty.
+    """
+
+    sparse = True
+
+    chunk_bits: Final[int] = 4  # Chunk side is 2 ** chunk_bits
+    chunk_mask: Final[int] = (1 << chunk_bits) - 1
+
+    __chunks: dict[tuple[int, int], list[Entity | None]]
+    __counts: dict[tuple[int, int], int]  # Entities per chunk
+
+    def __init__(self, width: int, height: int):
+        super().__init__(width, height)
+        self.clear()
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self.__chunks)
+
+    def get(self, x: int, y: int) -> Entity | None:
+        chunk = self.__chunks.get((x >> self.chunk_bits, y >> self.chunk_bits))
+        if chunk is None: return None
+        return chunk[((y & self.chunk_mask) << self.chunk_bits) | (x & self.chunk_mask)]
+
+    def set(self, x: int, y: int, value: Entity | None) -> None:
+        key = (x >> self.chunk_bits, y >> self.chunk_bits)
+        i = ((y & self.chunk_mask) << self.chunk_bits) | (x & self.chunk_mask)
+        chunk = self.__chunks.get(key)
+
+        # Empty
+        if value is None:
+            if chunk is None or chunk[i] is None: return
+            chunk[i] = None
+            self.__counts[key] -= 1
+            if self.__counts[key] == 0:
+                del self.__chunks[key]
+                del self.__counts[key]
+            return
+
+        # Place
+        if chunk is None:
+            chunk = [None] * (1 << (2 * self.chunk_bits))
+            self.__chunks[key] = chunk
+            self.__counts[key] = 0
+        if chunk[i] is None:
+            self.__counts[key] += 1
+        chunk[i] = value
+
+    def clear(self) -> None:
+        self.__chunks = dict()
+        self.__counts = dict()
+
+    def __iter__(self) -> Iterator[Entity | None]:
+        # Walks the whole area, prefer occupied()
+        for y in range(self.height):
+            for x in range(self.width):
+                yield self.get(x, y)
+
+    def occupied(self) -> Iterator[tuple[int, int, Entity]]:
+        bits, mask = self.chunk_bits, self.chunk_mask
+
+        found = []
+        for (chunk_x, chunk_y), cells in self.__chunks.items():
+            base_x, base_y = chunk_x << bits, chunk_y << bits
+            for i in compress(range(len(cells)), cells):
+                found.append((base_y + (i >> bits), base_x + (i & mask), cells[i]))
+        found.sort(key=lambda item: (item[0], item[1]))
+
+        for y, x, entity in found:
+            yield x, y, entity
@@ -1,21 +1,26 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Type, Any, Generator
+from typing import TYPE_CHECKING, Type, Any, Iterable, Iterator, Sequence
 
 from abc import ABCMeta
 from dataclasses import dataclass
-from random import randint
+from random import Random
 from math import floor
 
 from utils.rand_ext import chance
-import utils.activator as activator
-from utils.action_queue import ActionPriorityQueue
+from utils.step_phases import StepPhases
 from utils.math import clamp
+from utils.spatial_index import SpatialIndex
+from utils.profiler import StepProfile
+from time import perf_counter
 
 from zeroplayer.snapshotable import Snapshotable, Snapshot
+from zeroplayer.field_storage import FieldStorage, FlatFieldStorage, ChunkedFieldStorage
+from zeroplayer.step_priorities import StepPriority
 
 # annotations
 if TYPE_CHECKING:
     from zeroplayer.entities.entity import Entity
+    from zeroplayer.metrics import MetricsRecorder
 
 
 class Location(Snapshotable, metaclass=ABCMeta):
@@ -26,11 +31,32 @@ class Location(Snapshotable, metaclass=ABCMeta):
 
     #region //// Init
 
-    def __init__(self, width: int, height: int, spawn_rules: tuple[SpawnRule, ...] = (), initial_spawn_rolls: int = 0):
+    def __init__(
+            self,
+            width: int,
+            height: int,
+            spawn_rules: tuple[SpawnRule, ...] = (),
+            initial_spawn_rolls: int = 0,
+            seed: int | None = None,
+            sparse: bool = False
+    ):
+        # Random (before anything random happens)
+        self.random = Random(seed)
+
         # Field
         self.__width = width
         self.__height = height
-        self.clear()
+        self.__storage = (self._sparse_storage_type if sparse else self._storage_type)(width, height)
+        self.__index = SpatialIndex()
+        self.__entities = dict()
+        self.__changed = set()
+        self.__changed_all = True
+        self.__reset_spawning_enabled = None
+        self.__reset_random_state = None
+
+        # Stepping
+        self.__steps_performed = 0
+        self.metrics = None
 
         # Spawning
         self.__spawn_rules = spawn_rules
@@ -39,15 +65,35 @@ class Location(Snapshotable, metaclass=ABCMeta):
             self.spawn()
 
         # Stepping
-        self.__actions = ActionPriorityQueue()
+        self.profile = None
+
+    @classmethod
+    def create_empty(cls, width: int, height: int, sparse: bool = False) -> Location:
+        """
+        Virtual.
+        Creates a location of this type without entities, e.g. to restore it from a snapshot.
+        """
+        return cls(width, height, sparse=sparse)
+
+    #endregion
+
+    #region //// Random
+
+    # Every random decision of the location and its entities is made with this generator
+    random: Random
 
     #endregion
 
     #region //// Field
 
+    # Sparse locations take memory per entity instead of per cell,
+    # for large mostly empty fields
+    _storage_type: Type[FieldStorage] = FlatFieldStorage
+    _sparse_storage_type: Type[FieldStorage] = ChunkedFieldStorage
+
     __width: int
     __height: int
-    rows: list[list[Entity | None]]  # List of rows
+    __storage: FieldStorage
 
     @property
     def width(self) -> int:
@@ -57,12 +103,36 @@ class Location(Snapshotable, metaclass=ABCMeta):
     def height(self) -> int:
         return self.__height
 
+    @property
+    def sparse(self) -> bool:
+        return self.__storage.sparse
+
+    def rows_snapshot(self) -> list[Sequence[Entity | None]]:
+        """Returns the field as a list of rows, for reading only. Builds the rows on every call."""
+        return self.__storage.rows()
+
     def clear(self):
         """Creates a new empty field"""
-        self.rows = [[None for _ in range(self.__width)] for _ in range(self.__height)]
+        storage = self.__storage
+        if storage.width != self.__width or storage.height != self.__height:
+            self.__storage = type(storage)(self.__width, self.__height)
+        elif len(self.__entities) > 0:  # An empty storage is kept as is
+            storage.clear()
+        self.__index.clear()
+        self.__entities = dict()
+        self.__changed_all = True
 
     def clamp_position(self, x: int, y: int) -> tuple[int, int]:
         """Returns position clamped to within location"""
+
+        # Integer positions (almost all of them) skip rounding
+        if type(x) is int and type(y) is int:
+            width, height = self.__width, self.__height
+            return (
+                0 if x < 0 else width - 1 if x >= width else x,
+                0 if y < 0 else height - 1 if y >= height else y
+            )
+
         return round(clamp(x, 0, self.__width-1)), round(clamp(y, 0, self.__height-1))
 
     def entity_at_position(self, x: int, y: int) -> Entity | None:
@@ -71,39 +141,174 @@ class Location(Snapshotable, metaclass=ABCMeta):
         return self[x, y]
 
     def position_empty(self, x: int, y: int) -> bool:
-        return self.entity_at_position(x, y) is None
+        x, y = self.clamp_position(x, y)
+        return self.__storage.is_empty(x, y)
+
+    def free_positions(self, positions: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+        """
+        Returns positions (within location) that are not occupied, keeping their order.
+        Repeated positions are kept.
+        """
+        return self.__storage.free_positions(positions)
 
     def __getitem__(self, key: tuple[int, int]):
-        return self.rows[key[1]][key[0]]
+        return self.__storage.get(key[0], key[1])
 
     def __setitem__(self, key: tuple[int, int], value: Entity | None):
-        self.rows[key[1]][key[0]] = value
+        x, y = key
+        storage = self.__storage
+
+        # Keep the index and the registry in sync
+        i = y * self.__width + x
+        previous = storage.get(x, y)
+        if previous is not None:
+            self.__index.remove(type(previous), x, y)
+            del self.__entities[i]
+        if value is not None:
+            self.__index.add(type(value), x, y)
+            self.__entities[i] = value
+
+        # Track changes
+        if not self.__changed_all:
+            self.__changed.add((x, y))
+
+        storage.set(x, y, value)
+
+    def __iter__(self) -> Iterator[Entity | None]:
+        """Iterates over all cells in reading order"""
+        return iter(self.__storage)
+
+    def occupied(self) -> Iterator[tuple[int, int, Entity]]:
+        """Iterates over (x, y, entity) of non-empty cells in reading order"""
+        return self.__storage.occupied()
+
+    #endregion
+
+    #region //// Spatial queries
+
+    # Positions of entities are indexed by exact entity type
+    # (subclasses are not matched by their parents).
+    # Entities are also registered by cell index (y * width + x).
+
+    __index: SpatialIndex
+    __entities: dict[int, Entity]
+
+    def count_of_type(self, entity_type: Type[Entity]) -> int:
+        """Returns amount of entities of exact type on the field"""
+        return self.__index.count(entity_type)
+
+    def entities_of_type(self, entity_type: Type[Entity]) -> list[Entity]:
+        """Returns entities of exact type on the field, in no particular order"""
+        return [self[x, y] for x, y in self.__index.positions(entity_type)]
+
+    def positions_of_types(self, entity_types: tuple[Type[Entity], ...], x: int, y: int, radius: int) \
+            -> list[tuple[int, int]]:
+        """
+        Returns positions of entities of given types within
+        a square of radius around (x, y), sorted by x, then by y.
+        """
+        return self.__index.in_square(entity_types, x, y, radius)
+
+    def nearest_of_types(self, entity_types: tuple[Type[Entity], ...], x: int, y: int, radius: int) \
+            -> tuple[int, int] | None:
+        """
+        Returns position of the closest entity of given types within
+        a square of radius around (x, y), or None.
+        """
+        return self.__index.nearest(entity_types, x, y, radius)
+
+    def entities(self) -> list[Entity]:
+        """Returns all entities on the field in reading order"""
+        entities = self.__entities
+        return [entities[i] for i in sorted(entities)]
+
+    #endregion
+
+    #region //// Change tracking
+
+    # Positions set through __setitem__ since last reset.
+    # Stepping and clearing change the whole field.
+
+    __changed: set[tuple[int, int]]
+    __changed_all: bool
+    __reset_spawning_enabled: bool | None
+    __reset_random_state: tuple | None
 
-    def __iter__(self) -> Generator[Entity | None, None, None]:
-        """Iterates over all entities in reading order"""
-        for row in self.rows:
-            for entity in row:
-                yield entity
+    def changed_positions(self) -> set[tuple[int, int]] | None:
+        """Returns positions changed since last reset, or None if the whole field has changed"""
+        return None if self.__changed_all else set(self.__changed)
+
+    def has_changes(self) -> bool:
+        """Returns whether cells, the spawning toggle or the random state have changed since last reset"""
+        return self.__changed_all \
+            or len(self.__changed) > 0 \
+            or self.spawning_enabled != self.__reset_spawning_enabled \
+            or self.random.getstate() != self.__reset_random_state
+
+    def reset_changes(self) -> None:
+        self.__changed = set()
+        self.__changed_all = False
+        self.__reset_spawning_enabled = self.spawning_enabled
+        self.__reset_random_state = self.random.getstate()
 
     #endregion
 
     #region //// Stepping
 
-    __actions: ActionPriorityQueue
+    # Actions of entities are declared with step_action,
+    # every step performs them phase by phase, in StepPriority order.
+    __phases: StepPhases = StepPhases(StepPriority)
+    __steps_performed: int
+    profile: StepProfile | None  # Timings are collected while set
+    metrics: MetricsRecorder | None  # Metrics are recorded while set
+
+    @property
+    def steps_performed(self) -> int:
+        return self.__steps_performed
 
     def step(self) -> None:
-        """Gets and performs all actions among entities"""
+        """Performs all actions among entities"""
 
-        # Get actions
-        for entity in self:
-            if entity is not None:
-                entity.step(self.__actions)
+        # Every entity changes during a step
+        self.__changed_all = True
+
+        if self.profile is not None:
+            self.__step_profiled(self.profile)
+        else:
+            # Entities present before spawning act during the step
+            entities = self.entities()
+
+            # Spawn new entities
+            self.spawn()
+
+            # Perform actions
+            self.__phases.perform(entities)
+
+        self.__steps_performed += 1
+        if self.metrics is not None:
+            self.metrics.end_step(self)
+
+    def __step_profiled(self, profile: StepProfile) -> None:
+        """Same as step, recording timings to the profile"""
+        step_start = perf_counter()
+
+        # Entities present before spawning act during the step
+        phase_start = perf_counter()
+        entities = self.entities()
+        actions = self.__phases.count_actions(entities)
+        profile.record_phase("gather", perf_counter() - phase_start, actions)
 
         # Spawn new entities
+        phase_start = perf_counter()
         self.spawn()
+        profile.record_phase("spawn", perf_counter() - phase_start)
 
         # Perform actions
-        self.__actions.perform()
+        phase_start = perf_counter()
+        self.__phases.perform_profiled(entities, profile)
+        profile.record_phase("perform", perf_counter() - phase_start, actions)
+
+        profile.record_phase("step", perf_counter() - step_start, actions)
 
     #endregion
 
@@ -121,68 +326,116 @@ class Location(Snapshotable, metaclass=ABCMeta):
         for rule in self.__spawn_rules:
 
             # Chance
-            if not chance(rule.spawn_chance): continue
+            if not chance(rule.spawn_chance, self.random): continue
 
             # Quantity
             spawns_count = \
-                randint(rule.quantity_min, rule.quantity_max) \
+                self.random.randint(rule.quantity_min, rule.quantity_max) \
                 if rule.quantity_min < rule.quantity_max \
                 else rule.quantity_min
 
-            # Spawning
-            for i in range(spawns_count):
+            # Sample all positions at once (x, y per spawn - same draws as one by one)
+            randrange = self.random.randrange
+            width, height = self.width, self.height
+            candidates = [(randrange(width), randrange(height)) for _ in range(spawns_count)]
 
-                # Pick position
-                x = randint(0, self.width-1)
-                y = randint(0, self.height-1)
+            # Skip occupied, including cells taken by earlier spawns of the rule
+            positions = []
+            taken = set()
+            for x, y in self.free_positions(candidates):
+                if (x, y) not in taken:
+                    taken.add((x, y))
+                    positions.append((x, y))
 
-                # Spawn in unoccupied
-                if self.entity_at_position(x, y) is None:
-                    entity = activator.create_instance(rule.entity_type, rule.entity_params)
-                    entity.place_at(self, x, y)
+            # Place
+            entity_type, entity_params = rule.entity_type, rule.entity_params
+            for x, y in positions:
+                entity_type(*entity_params).place_at(self, x, y)
+
+            if self.metrics is not None:
+                self.metrics.record_spawn(entity_type, len(positions))
 
     #endregion
 
     #region //// Snapshot
 
-    def fill_snapshot(self, snapshot: Snapshot):
+    def fill_snapshot(self, snapshot: Snapshot, include_field: bool = True):
+        """
+        Adds location data to the snapshot.
+        Without the field entities are not added (for savers that write them on their own).
+        """
 
         # Field
         snapshot.set_data(Location, "width", self.__width)
         snapshot.set_data(Location, "height", self.__height)
-
-        # Entities
-        def helper_process_entity(entity):
-            if entity is None: return None
-
-            entity_snapshot = entity.form_snapshot()
-            entity_snapshot.set_data(None, "type", type(entity))
-            return entity_snapshot
-
-        field = [helper_process_entity(entity) for entity in self]
-        snapshot.set_data(Location, "field", field)
+        if self.sparse:
+            snapshot.set_data(Location, "sparse", True)
+
+        # Entities (every cell, or only occupied ones for sparse)
+        if include_field and self.sparse:
+            cells = [[x, y, self.form_entity_snapshot(entity)] for x, y, entity in self.occupied()]
+            snapshot.set_data(Location, "cells", cells)
+        elif include_field:
+            field: list[Snapshot | None] = [None] * (self.__width * self.__height)
+            for x, y, entity in self.occupied():
+                field[y * self.__width + x] = self.form_entity_snapshot(entity)
+            snapshot.set_data(Location, "field", field)
 
         # Spawning
         snapshot.set_data(Location, "doSpawn", self.spawning_enabled)
 
+        # Stepping
+        snapshot.set_data(Location, "steps", self.__steps_performed)
+
     def restore_from_snapshot(self, snapshot: Snapshot):
 
         # Field
         self.__width = snapshot.get_data(Location, "width")
         self.__height = snapshot.get_data(Location, "height")
-        self.clear()
-
-        # Entities
-        for i, entity_snapshot in enumerate(snapshot.get_data(Location, "field")):
-            if entity_snapshot is None: continue
-
-            entity = entity_snapshot.get_data(None, "type")()
-            entity.place_at(self, i % self.width, floor(i / self.width))
-            entity.restore_from_snapshot(entity_snapshot)
+        sparse = snapshot.get_data(Location, "sparse", False)
+        storage_type = self._sparse_storage_type if sparse else self._storage_type
+        if type(self.__storage) is not storage_type:
+            self.__storage = storage_type(self.__width, self.__height)
+        self.clear()  # Reuses the storage of create_empty, which is already empty
+
+        # Entities (may be absent, see fill_snapshot)
+        if sparse:
+            for x, y, entity_snapshot in snapshot.get_data(Location, "cells", ()):
+                self.restore_entity_from_snapshot(x, y, entity_snapshot)
+        else:
+            for i, entity_snapshot in enumerate(snapshot.get_data(Location, "field", ())):
+                if entity_snapshot is None: continue
+                self.restore_entity_from_snapshot(i % self.width, floor(i / self.width), entity_snapshot)
 
         # Spawning
         self.spawning_enabled = snapshot.get_data(Location, "doSpawn")
 
+        # Stepping
+        self.__steps_performed = snapshot.get_data(Location, "steps", 0)
+
+    @staticmethod
+    def form_entity_snapshot(entity: Entity | None) -> Snapshot | None:
+        """Forms snapshot of an entity with its type (None for no entity)"""
+        if entity is None: return None
+
+        entity_snapshot = entity.form_snapshot()
+        entity_snapshot.set_data(None, "type", type(entity))
+        return entity_snapshot
+
+    def restore_entity_from_snapshot(self, x: int, y: int, entity_snapshot: Snapshot | None):
+        """Replaces contents of a cell with an entity created from snapshot formed by form_entity_snapshot"""
+
+        # Clear the cell
+        present = self[x, y]
+        if present is not None:
+            present.remove()
+
+        if entity_snapshot is None: return
+
+        entity = entity_snapshot.get_data(None, "type")()
+        entity.place_at(self, x, y)
+        entity.restore_from_snapshot(entity_snapshot)
+
     #endregion
 
 
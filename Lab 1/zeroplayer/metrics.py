@@ -0,0 +1,141 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Type, TextIO, Final
+import csv
+
+from zeroplayer.entities.entity_decaying import EntityDecaying
+from zeroplayer.animals import plants, herbivores, carnivores
+
+# annotations
+if TYPE_CHECKING:
+    from zeroplayer.location import Location
+    from zeroplayer.entities.entity import Entity
+
+
+#region //// Constants
+
+# Entity types population studies and metrics are collected for, in column order
+population_types: Final[tuple[Type[Entity], ...]] = (
+    plants.Grass,
+    plants.Wheat,
+    herbivores.Mouse,
+    herbivores.Rabbit,
+    herbivores.DeadMouse,
+    herbivores.DeadRabbit,
+    carnivores.Fox,
+    carnivores.Owl
+)
+
+#endregion
+
+
+class CsvMetricsSink:
+    """
+    Writes metric rows to a csv file, keeping at most buffer_rows rows in memory.
+    Appends to existing files (header is only written to empty files).
+    """
+
+    __file: TextIO
+    __writer: csv.writer
+    __buffer: list[list[float | int]]
+    __buffer_rows: int
+
+    def __init__(self, filename: str, columns: list[str], buffer_rows: int = 256):
+        self.__file = open(filename, mode="at", encoding="utf-8", newline="")
+        self.__writer = csv.writer(self.__file)
+        self.__buffer = []
+        self.__buffer_rows = max(1, buffer_rows)
+
+        if self.__file.tell() == 0:
+            self.__writer.writerow(columns)
+
+    def write(self, row: list[float | int]) -> None:
+        self.__buffer.append(row)
+        if len(self.__buffer) >= self.__buffer_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        self.__writer.writerows(self.__buffer)
+        self.__buffer.clear()
+        self.__file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self.__file.close()
+
+
+class MetricsRecorder:
+    """
+    Collects per step metrics of a location for a set of entity types:
+    population, mean integrity (satiety for creatures), births, kills (by hunters) and natural spawns.
+
+    Events are counted as they happen (location and entities report them),
+    population is read from the location index, integrity only from entities of given types.
+    A row is written to the sink at the end of every step.
+    """
+
+    __entity_types: tuple[Type[Entity], ...]
+    __sink: CsvMetricsSink
+    __births: dict[type, int]
+    __kills: dict[type, int]
+    __spawns: dict[type, int]
+
+    def __init__(self, sink: CsvMetricsSink, entity_types: tuple[Type[Entity], ...]):
+        self.__sink = sink
+        self.__entity_types = entity_types
+        self.__reset_events()
+
+    @staticmethod
+    def columns(type_names: list[str]) -> list[str]:
+        """Returns column names of written rows for given names of entity types"""
+        columns = ["step"]
+        for name in type_names:
+            columns += [f"{name}_count", f"{name}_integrity", f"{name}_births", f"{name}_kills", f"{name}_spawns"]
+        return columns
+
+    #region //// Events
+
+    def __reset_events(self):
+        self.__births = dict()
+        self.__kills = dict()
+        self.__spawns = dict()
+
+    def record_birth(self, entity_type: type) -> None:
+        self.__births[entity_type] = self.__births.get(entity_type, 0) + 1
+
+    def record_kill(self, entity_type: type) -> None:
+        """Records a kill of an entity by a hunter (deaths from decay or age are not kills)"""
+        self.__kills[entity_type] = self.__kills.get(entity_type, 0) + 1
+
+    def record_spawn(self, entity_type: type, count: int = 1) -> None:
+        self.__spawns[entity_type] = self.__spawns.get(entity_type, 0) + count
+
+    #endregion
+
+    #region //// Rows
+
+    def end_step(self, location: Location) -> None:
+        """Writes the row of the step that was just performed and starts counting events anew"""
+        row: list[float | int] = [location.steps_performed]
+
+        for entity_type in self.__entity_types:
+            count = location.count_of_type(entity_type)
+
+            integrity = 0.0
+            if count > 0 and issubclass(entity_type, EntityDecaying):
+                integrity = sum(entity.integrity for entity in location.entities_of_type(entity_type)) / count
+
+            row += [
+                count,
+                integrity,
+                self.__births.get(entity_type, 0),
+                self.__kills.get(entity_type, 0),
+                self.__spawns.get(entity_type, 0)
+            ]
+
+        self.__sink.write(row)
+        self.__reset_events()
+
+    def close(self) -> None:
+        self.__sink.close()
+
+    #endregion
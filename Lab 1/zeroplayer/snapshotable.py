@@ -5,6 +5,8 @@ from abc import ABC, abstractmethod
 
 class Snapshotable(ABC):
 
+    __slots__ = ()
+
     def form_snapshot(self) -> Snapshot:
         """Creates a new snapshot, fills it and returns it."""
         snapshot = Snapshot()
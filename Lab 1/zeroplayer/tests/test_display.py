@@ -0,0 +1,75 @@
+import unittest
+from zeroplayer.location import Location
+from zeroplayer.field_columns import FieldColumns
+from zeroplayer.animals import plants, carnivores
+from zeroplayer import display
+from utils.exceptions import InvalidInputError
+
+
+class TestDisplay(unittest.TestCase):
+
+    def test_render_location(self):
+        location = Location(3, 2)
+        plants.Grass().place_at(location, 1, 0)
+        carnivores.Fox().place_at(location, 2, 1)
+
+        self.assertEqual(display.render_location(location, False), "·g·\n··F\n")
+
+        gray = display.color_escapes[display.Colors.DK_GRAY]
+        green = display.color_escapes[display.Colors.LT_GREEN]
+        magenta = display.color_escapes[display.Colors.LT_MAGENTA]
+        default = display.color_escapes[display.Colors.DEFAULT]
+        self.assertEqual(
+            display.render_location(location, True),
+            f"{gray}·{green}g{gray}·{default}\n{gray}··{magenta}F{default}\n"
+        )
+
+    def test_render_sparse(self):
+        dense, sparse = Location(4, 3), Location(4, 3, sparse=True)
+        for location in (dense, sparse):
+            plants.Grass().place_at(location, 3, 0)
+            carnivores.Fox().place_at(location, 0, 2)
+
+        for render_colored in (False, True):
+            self.assertEqual(
+                display.render_location(sparse, render_colored),
+                display.render_location(dense, render_colored)
+            )
+        self.assertEqual(display.location_cells(sparse), display.location_cells(dense))
+
+        huge = Location(100_000, 100_000, sparse=True)
+        with self.assertRaises(InvalidInputError):
+            display.render_location(huge, False)
+        with self.assertRaises(InvalidInputError):
+            display.location_cells(huge)
+
+    def test_render_columns(self):
+        location = Location(3, 2)
+        plants.Grass().place_at(location, 1, 0)
+        carnivores.Fox().place_at(location, 2, 1)
+        carnivores.Fox().place_at(location, 0, 0)
+        columns = FieldColumns.from_location(location)
+
+        for render_colored in (False, True):
+            self.assertEqual(
+                display.render_columns(columns, render_colored),
+                display.render_location(location, render_colored)
+            )
+
+    def test_render_cells_diff(self):
+        location = Location(3, 2)
+        before = display.location_cells(location)
+
+        plants.Grass().place_at(location, 1, 0)
+        plants.Grass().place_at(location, 2, 0)
+        after = display.location_cells(location)
+
+        self.assertEqual(display.render_cells_diff(before, before, 3, False), "")
+        self.assertEqual(display.render_cells_diff(before, after, 3, False), display.cursor_to(0, 1) + "gg")
+
+        full = display.render_cells_diff(None, after, 3, False)
+        self.assertEqual(full, display.cursor_to(0, 0) + "·gg" + display.cursor_to(1, 0) + "···")
+
+
+if __name__ == '__main__':
+    unittest.main()
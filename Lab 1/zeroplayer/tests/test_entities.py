@@ -0,0 +1,38 @@
+import unittest
+from zeroplayer.location import Location
+from zeroplayer.entities.entity_moving import EntityMoving
+from zeroplayer.animals import herbivores
+
+
+class TestEntitySlots(unittest.TestCase):
+
+    class Drifter(EntityMoving):
+        __slots__ = EntityMoving.branch_slots
+
+    def test_branch_slots(self):
+        for entity in (herbivores.Mouse(), self.Drifter()):
+            with self.subTest(entity=type(entity).__name__):
+                self.assertFalse(hasattr(entity, "__dict__"))
+
+        drifter = self.Drifter()
+        drifter.place_at(Location(3, 3), 0, 0)
+        drifter.set_move_target(2, 1)
+        self.assertEqual(drifter.get_move_target_position(), (2, 1))
+
+    def test_branch_slots_checked(self):
+        with self.assertRaises(TypeError):
+            class Missing(EntityMoving):
+                __slots__ = ()
+
+        with self.assertRaises(TypeError):
+            class Branch(EntityMoving):
+                __slots__ = ()
+                branch_slots = ("_Branch__field",)
+
+        # Classes with __dict__ need no slots
+        class Unslotted(EntityMoving):
+            pass
+
+
+if __name__ == '__main__':
+    unittest.main()
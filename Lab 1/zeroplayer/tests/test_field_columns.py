@@ -0,0 +1,52 @@
+import math
+import unittest
+from zeroplayer.location import Location
+from zeroplayer.field_columns import FieldColumns
+from zeroplayer.animals import plants, herbivores
+
+
+class TestFieldColumns(unittest.TestCase):
+
+    def test_from_location(self):
+        location = Location(4, 3)
+
+        grass = plants.Grass()
+        grass.place_at(location, 1, 0)
+        mouse = herbivores.Mouse()
+        mouse.place_at(location, 3, 2)
+        mouse.set_move_target(0, 2)
+        plants.Grass().place_at(location, 0, 1)
+
+        columns = FieldColumns.from_location(location)
+        self.assertEqual(columns.type_table, [plants.Grass, herbivores.Mouse])
+        self.assertEqual(list(columns.type_codes), [0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 2])
+        self.assertEqual(columns.type_at(3, 2), herbivores.Mouse)
+        self.assertIsNone(columns.type_at(0, 0))
+
+        self.assertEqual(columns.integrity[1], grass.integrity)
+        self.assertTrue(math.isnan(columns.integrity[0]))
+        self.assertEqual(columns.procreation_cd[11], mouse.procreation_cooldown)
+        self.assertEqual(columns.procreation_cd[1], -1)
+        self.assertEqual((columns.target_x[11], columns.target_y[11]), (0, 2))
+
+        self.assertEqual(columns.population(), {plants.Grass: 2, herbivores.Mouse: 1})
+
+    def test_from_columns(self):
+        location = Location(3, 2)
+        herbivores.Mouse().place_at(location, 2, 1)
+        source = FieldColumns.from_location(location)
+
+        # Wraps memoryviews as they are, without copying
+        views = {name: memoryview(getattr(source, name)) for name, _ in FieldColumns.column_typecodes}
+        columns = FieldColumns.from_columns(3, 2, source.type_table, **views)
+        self.assertIs(columns.type_codes, views["type_codes"])
+        self.assertEqual(columns.type_at(2, 1), herbivores.Mouse)
+        self.assertEqual(columns.population(), {herbivores.Mouse: 1})
+
+        views["lifetime"] = views["lifetime"][1:]
+        with self.assertRaises(ValueError):
+            FieldColumns.from_columns(3, 2, source.type_table, **views)
+
+
+if __name__ == '__main__':
+    unittest.main()
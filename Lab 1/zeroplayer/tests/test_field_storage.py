@@ -0,0 +1,81 @@
+import unittest
+from zeroplayer.field_storage import FlatFieldStorage, ChunkedFieldStorage
+from zeroplayer.location import Location
+from zeroplayer.animals import plants
+
+
+class TestFieldStorage(unittest.TestCase):
+
+    def test_storages(self):
+        for storage_type in (FlatFieldStorage, ChunkedFieldStorage):
+            with self.subTest(storage_type=storage_type.__name__):
+                storage = storage_type(3, 2)
+                storage.set(2, 0, "a")
+                storage.set(0, 1, "b")
+                storage.set(1, 1, "c")
+
+                self.assertEqual(storage.get(2, 0), "a")
+                self.assertIsNone(storage.get(0, 0))
+                self.assertTrue(storage.is_empty(0, 0))
+                self.assertFalse(storage.is_empty(1, 1))
+                self.assertEqual(list(storage), [None, None, "a", "b", "c", None])
+                self.assertEqual(list(storage.occupied()), [(2, 0, "a"), (0, 1, "b"), (1, 1, "c")])
+                self.assertEqual([list(row) for row in storage.rows()], [[None, None, "a"], ["b", "c", None]])
+                self.assertEqual(storage.free_positions([(0, 0), (1, 1), (2, 1)]), [(0, 0), (2, 1)])
+
+                storage.clear()
+                self.assertEqual(list(storage.occupied()), [])
+
+    def test_occupancy(self):
+        storage = FlatFieldStorage(3, 2)
+        storage.set(1, 0, "a")
+        storage.set(2, 1, "b")
+        storage.set(2, 1, None)
+        self.assertEqual(bytes(storage.occupancy), bytes([0, 1, 0, 0, 0, 0]))
+        self.assertFalse(storage.is_empty(1, 0))
+        self.assertTrue(storage.is_empty(2, 1))
+
+        storage.clear()
+        self.assertEqual(bytes(storage.occupancy), bytes(6))
+
+    def test_location_storage(self):
+        location = Location(3, 2)
+        grass = plants.Grass()
+        grass.place_at(location, 1, 1)
+
+        self.assertIs(location[1, 1], grass)
+        self.assertEqual(list(location.occupied()), [(1, 1, grass)])
+        self.assertIs(location.rows_snapshot()[1][1], grass)
+
+        location.clear()
+        self.assertIsNone(location[1, 1])
+
+    def test_chunked(self):
+        storage = ChunkedFieldStorage(100_000, 100_000)
+        storage.set(99_999, 5, "a")
+        storage.set(3, 70_000, "b")
+        storage.set(4, 70_000, "c")
+        storage.set(0, 0, None)
+        self.assertEqual(storage.chunk_count, 2)
+        self.assertEqual(list(storage.occupied()), [(99_999, 5, "a"), (3, 70_000, "b"), (4, 70_000, "c")])
+
+        storage.set(99_999, 5, None)
+        self.assertEqual(storage.chunk_count, 1)
+        self.assertIsNone(storage.get(99_999, 5))
+
+    def test_sparse_location_snapshot(self):
+        location = Location(100_000, 100_000, sparse=True)
+        plants.Grass().place_at(location, 50_000, 7)
+        plants.Wheat().place_at(location, 200_000, -3)  # Clamped to (99_999, 0)
+
+        restored = Location(1, 1)
+        restored.restore_from_snapshot(location.form_snapshot())
+        self.assertTrue(restored.sparse)
+        self.assertEqual(
+            [(x, y, type(entity)) for x, y, entity in restored.occupied()],
+            [(99_999, 0, plants.Wheat), (50_000, 7, plants.Grass)]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from random import Random
+from zeroplayer.location import Location, SpawnRule
+from zeroplayer.field_storage import FlatFieldStorage
+from zeroplayer.animals import plants, herbivores, carnivores
+
+
+class TestLocation(unittest.TestCase):
+
+    def test_occupancy(self):
+        location = Location(4, 3)
+        self.assertEqual(location.clamp_position(-2, 7), (0, 2))
+        self.assertEqual(location.clamp_position(2.6, 1.2), (3, 1))
+
+        grass = plants.Grass()
+        grass.place_at(location, 1, 1)
+        self.assertFalse(location.position_empty(1, 1))
+        self.assertTrue(location.position_empty(2, 1))
+        self.assertEqual(location.free_positions([(0, 0), (1, 1), (2, 1), (0, 0)]), [(0, 0), (2, 1), (0, 0)])
+
+        grass.remove()
+        self.assertTrue(location.position_empty(1, 1))
+
+        grass.place_at(location, 3, 2)
+        location.clear()
+        self.assertTrue(location.position_empty(3, 2))
+
+    def test_entities_registry(self):
+        location = Location(4, 3)
+        mouse = herbivores.Mouse()
+        mouse.place_at(location, 3, 2)
+        grass = plants.Grass()
+        grass.place_at(location, 1, 0)
+        rabbit = herbivores.Rabbit()
+        rabbit.place_at(location, 0, 1)
+        self.assertEqual(location.entities(), [grass, rabbit, mouse])
+
+        mouse.place_at(location, 0, 0)
+        grass.remove()
+        self.assertEqual(location.entities(), [mouse, rabbit])
+
+        herbivores.Mouse().place_at(location, 0, 1)  # Replaces the rabbit
+        self.assertNotIn(rabbit, location.entities())
+        self.assertEqual(len(location.entities()), 2)
+
+        location.clear()
+        self.assertEqual(location.entities(), [])
+
+    def test_restore_allocates_once(self):
+
+        class CountingStorage(FlatFieldStorage):
+            clears = 0
+
+            def clear(self):
+                CountingStorage.clears += 1
+                super().clear()
+
+        class CountingLocation(Location):
+            _storage_type = CountingStorage
+
+        source = Location(5, 4)
+        herbivores.Mouse().place_at(source, 2, 3)
+        snapshot = source.form_snapshot()
+
+        restored = CountingLocation.create_empty(5, 4)
+        restored.restore_from_snapshot(snapshot)
+        self.assertEqual(CountingStorage.clears, 1)  # Only by the constructor of the storage
+        self.assertIsInstance(restored[2, 3], herbivores.Mouse)
+
+        # A filled field is still emptied
+        restored.restore_from_snapshot(Location(5, 4).form_snapshot())
+        self.assertEqual(restored.entities(), [])
+
+    def test_spawn(self):
+        rules = (SpawnRule(plants.Grass, (), 6, 6, 1.0), SpawnRule(plants.Wheat, (), 1, 3, 0.0))
+        location = Location(3, 3, rules, seed=5)
+        plants.Wheat().place_at(location, 1, 1)
+
+        class Recorder:
+            def __init__(self):
+                self.spawns = []
+
+            def record_spawn(self, entity_type, count=1):
+                self.spawns.append((entity_type, count))
+
+        recorder = Recorder()
+        location.metrics = recorder
+        location.spawn()
+
+        # Same draws as spawning one by one: chance, then x and y per spawn
+        reference = Random(5)
+        reference.random()
+        expected = []
+        for _ in range(6):
+            position = (reference.randrange(3), reference.randrange(3))
+            if position != (1, 1) and position not in expected:
+                expected.append(position)
+        reference.random()
+
+        grass = [(x, y) for x, y, entity in location.occupied() if type(entity) is plants.Grass]
+        self.assertEqual(sorted(grass), sorted(expected))
+        self.assertEqual(location.count_of_type(plants.Wheat), 1)
+        self.assertEqual(recorder.spawns, [(plants.Grass, len(expected))])
+        self.assertEqual(location.random.getstate(), reference.getstate())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import csv
+import os
+import tempfile
+import unittest
+from zeroplayer.location import Location
+from zeroplayer.metrics import MetricsRecorder, CsvMetricsSink
+from zeroplayer.animals import plants, herbivores, carnivores
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_recording(self):
+        types = (plants.Grass, herbivores.Rabbit, herbivores.DeadRabbit, carnivores.Fox)
+        names = ["grass", "rabbit", "rabbitDead", "fox"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "metrics.csv")
+
+            location = Location(10, 10)
+            location.metrics = MetricsRecorder(CsvMetricsSink(filename, MetricsRecorder.columns(names), 1), types)
+
+            plants.Grass().place_at(location, 0, 0)
+            plants.Grass().place_at(location, 9, 9)
+            rabbit = herbivores.Rabbit()
+            rabbit.place_at(location, 5, 5)
+            rabbit.kill()  # Not a kill by a hunter
+            carnivores.Fox().place_at(location, 9, 0)
+            herbivores.Rabbit().place_at(location, 9, 1)
+
+            location.step()
+            location.metrics.close()
+
+            with open(filename, newline="") as file:
+                rows = list(csv.DictReader(file))
+
+        self.assertEqual(len(rows), 1)
+        row = rows[0]
+        self.assertEqual(row["step"], "1")
+        self.assertEqual(row["grass_count"], "2")
+        self.assertAlmostEqual(float(row["grass_integrity"]), 1.0 - plants.Grass._decay_speed)
+        self.assertEqual(row["rabbit_count"], "0")
+        self.assertEqual(row["rabbit_kills"], "1")
+        self.assertEqual(row["rabbitDead_count"], "1")
+        self.assertEqual(row["fox_count"], "1")
+
+
+if __name__ == '__main__':
+    unittest.main()